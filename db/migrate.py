@@ -1,6 +1,9 @@
+import logging
 import sqlite3
 import os
-from utils.config import get_database_file
+from utils.config import get_database_file, is_database_wal_enabled
+from utils.db import configure_connection
+from utils.logging_setup import init_logging
 from utils.constants import DATABASE_CONFIG_PATH, MIGRATIONS_DIR
 
 def get_applied_migrations(conn):
@@ -10,29 +13,82 @@ def get_applied_migrations(conn):
             applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
-    rows = conn.execute("SELECT filename FROM schema_migrations").fetchall()
-    return {row['filename'] for row in rows}
+    # Build the set straight from the cursor, without an intermediate list of rows
+    return {filename for filename, in conn.execute("SELECT filename FROM schema_migrations")}
 
-def apply_migration(conn, filename, sql):
-    print(f"Applying {filename}...")
-    conn.executescript(sql)
-    conn.execute("INSERT INTO schema_migrations (filename) VALUES (?)", [filename])
-    conn.commit()
+def split_statements(sql):
+    """
+    Split a migration script into individual SQL statements.
+    executescript() always commits a pending transaction first, so statements
+    are executed one by one to keep them inside the surrounding transaction.
+    """
+    statements = []
+    buffer = ""
+    for piece in sql.split(";"):
+        buffer += piece + ";"
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer)
+            buffer = ""
+    if buffer.strip():
+        statements.append(buffer)
+    return statements
+
+def apply_migrations(conn, pending):
+    """Apply (filename, sql) migrations in order and record them in schema_migrations in one batch."""
+    for filename, sql in pending:
+        for statement in split_statements(sql):
+            conn.execute(statement)
+    conn.executemany(
+        "INSERT INTO schema_migrations (filename) VALUES (?)",
+        [(filename,) for filename, _ in pending]
+    )
+
+def read_pending_migrations(applied):
+    """Read all migration files not yet applied, ordered by filename."""
+    # Cheapest checks first: the extension test, then the set lookup, then a possible stat
+    with os.scandir(MIGRATIONS_DIR) as entries:
+        filenames = sorted(
+            entry.name for entry in entries
+            if entry.name.endswith(".sql") and entry.name not in applied and entry.is_file()
+        )
+
+    pending = []
+    for filename in filenames:
+        with open(os.path.join(MIGRATIONS_DIR, filename), "r", encoding="utf-8") as f:
+            pending.append((filename, f.read()))
+    return pending
 
 def main(config_path: str):
     db_file = get_database_file(config_path)
     conn = sqlite3.connect(db_file)
+    conn.isolation_level = None
     conn.row_factory = sqlite3.Row
-    applied = get_applied_migrations(conn)
+    try:
+        configure_connection(conn, is_database_wal_enabled(config_path))
+
+        # Apply all pending migrations in one exclusive transaction, so a concurrent
+        # run waits for this one to finish and then finds nothing left to apply
+        # Keep the file lock for the whole run instead of re-acquiring it per statement
+        conn.execute("PRAGMA locking_mode=EXCLUSIVE")
+        conn.execute("BEGIN EXCLUSIVE")
+        try:
+            applied = get_applied_migrations(conn)
+            pending = read_pending_migrations(applied)
+            if pending:
+                apply_migrations(conn, pending)
 
-    migrations = sorted(os.listdir(MIGRATIONS_DIR))
-    for filename in migrations:
-        if filename not in applied and filename.endswith(".sql"):
-            with open(os.path.join(MIGRATIONS_DIR, filename), "r", encoding="utf-8") as f:
-                sql = f.read()
-            apply_migration(conn, filename, sql)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
 
-    print("✅ All migrations applied.")
+    if pending:
+        logging.info(f"✅ Applied {len(pending)} migrations: {', '.join(filename for filename, _ in pending)}")
+    else:
+        logging.info("✅ No pending migrations.")
 
 if __name__ == "__main__":
+    init_logging()
     main(DATABASE_CONFIG_PATH)
@@ -1,14 +1,70 @@
 import asyncio
 import logging
 import os
-from typing import List
-from dotenv import load_dotenv
+from typing import List, Optional, Tuple
 from models.article import Article
 from telegram import Bot
-from telegram.error import TelegramError
+from telegram.error import BadRequest, Forbidden, NetworkError, TelegramError, TimedOut
+from telegram.request import HTTPXRequest
+from tenacity import retry, retry_if_exception_type, retry_if_not_exception_type, stop_after_attempt, wait_exponential
+from utils.env import load_env_once
 
 # Load environment variables from .env file
-load_dotenv()
+load_env_once()
+
+# (token, event loop, bot, request) of the shared bot, see _get_bot
+_shared_bot: Optional[Tuple[str, asyncio.AbstractEventLoop, Bot, HTTPXRequest]] = None
+
+async def _get_bot(bot_token: str) -> Bot:
+    """
+    Return the shared bot, so its HTTP connection pool is reused across sends.
+    The pooled connections are bound to the event loop that opened them, so when
+    the running loop or the token changes the old bot is closed and a new one made.
+    """
+    global _shared_bot
+    loop = asyncio.get_running_loop()
+    if _shared_bot is not None:
+        token, bot_loop, bot, _ = _shared_bot
+        if token == bot_token and bot_loop is loop:
+            return bot
+        await close()
+
+    request = HTTPXRequest(connection_pool_size=32, pool_timeout=10.0, read_timeout=20.0)
+    bot = Bot(token=bot_token, request=request)
+    _shared_bot = (bot_token, loop, bot, request)
+    return bot
+
+async def close() -> None:
+    """Close the shared bot's HTTP connection pool; the next send creates a new bot."""
+    global _shared_bot
+    if _shared_bot is None:
+        return
+    _, bot_loop, _, request = _shared_bot
+    _shared_bot = None
+
+    # Bot.shutdown() only closes requests the bot initialized itself, which would cost
+    # a getMe call per bot, so the request is shut down directly. Connections bound to
+    # another loop (already closed by asyncio.run) can't be awaited from this one.
+    if bot_loop is asyncio.get_running_loop():
+        await request.shutdown()
+
+# Retry transient network failures (including Telegram 5xx responses). Timeouts are not
+# retried, since the message may already have been posted and a retry would duplicate it.
+# BadRequest subclasses NetworkError but fails the same way every time (bad entities,
+# message too long, chat not found), so it is raised right away, as is Forbidden.
+@retry(
+    retry=retry_if_exception_type(NetworkError) & retry_if_not_exception_type((TimedOut, BadRequest, Forbidden)),
+    wait=wait_exponential(multiplier=1, max=10),
+    stop=stop_after_attempt(4),
+    reraise=True
+)
+async def _send_message(bot: Bot, chat_id: str, post_text: str, parse_mode: str):
+    return await bot.send_message(
+        chat_id=chat_id,
+        text=post_text,
+        parse_mode=parse_mode,
+        disable_web_page_preview=True
+    )
 
 async def send_async(post_text: str) -> int:
     """
@@ -25,17 +81,12 @@ async def send_async(post_text: str) -> int:
         raise ValueError("Telegram credentials (TELEGRAM_BOT_TOKEN and TELEGRAM_CHANNEL) must be set in environment variables")
 
     try:
-        # Create bot instance
-        bot = Bot(token=bot_token)
+        # Get shared bot instance
+        bot = await _get_bot(bot_token)
         
         # Send message to Telegram
         logging.info(f"Sending post to Telegram channel {chat_id}")
-        message = await bot.send_message(
-            chat_id=chat_id,
-            text=post_text,
-            parse_mode=parse_mode,
-            disable_web_page_preview=True
-        )
+        message = await _send_message(bot, chat_id, post_text, parse_mode)
         
         logging.info(f"Successfully sent message to Telegram. Message ID: {message.message_id}")
         return message.message_id
@@ -49,11 +100,19 @@ async def send_async(post_text: str) -> int:
         logging.error(f"Post text that failed to send: {post_text}")
         raise
 
+async def _send_and_close(post_text: str) -> int:
+    """Send the post, then close the bot before asyncio.run closes its event loop."""
+    try:
+        return await send_async(post_text)
+    finally:
+        await close()
+
 def send(post_text: str) -> int:
     """
     Send digest post to Telegram (synchronous wrapper for async function).
+    Prefer awaiting send_async() directly when already running inside an event loop.
     
     Returns:
         int: The message ID of the sent message
     """
-    return asyncio.run(send_async(post_text))
+    return asyncio.run(_send_and_close(post_text))
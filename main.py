@@ -1,82 +1,85 @@
+import asyncio
+import functools
 import logging
-from typing import List, TypedDict
+from typing import TYPE_CHECKING, Annotated, List, TypedDict
 
-from langgraph.graph import StateGraph, START, END
-from dotenv import load_dotenv
-
-from sources.loader import load_all_articles
+from sources.loader import load_article_batches
 from models.article import Article
-from models.search_summary import SearchSummary
-from processing import scoring
-from processing.filtering import filter_top_articles
-from processing.post_creator import PostCreator
 from storage import article_storage
 from storage.article_storage import get_articles_after, update_relevance_scores
-from delivery import telegram
-from search.agent import SearchAgent
-from storage.summary_storage import save_search_summary
-from storage.search_result_storage import save_search_results
-from storage.delivery_storage import save_delivery, get_latest_delivery
+from storage.delivery_storage import save_delivery, get_latest_delivery_datetime
 from models.delivery import Delivery
 from utils.constants import DATABASE_CONFIG_PATH, SOURCES_CONFIG_PATH, SEARCH_AGENT_CONFIG_PATH, DELIVERY_CONFIG_PATH, POST_CREATOR_CONFIG_PATH
 from utils.config import load_config
-from utils.time_utils import should_run_delivery, parse_articles_freshness
+from utils.env import load_env_once
+from utils.logging_setup import init_logging
+from utils.time_utils import is_search_time_reached, should_run_delivery, parse_articles_freshness
+
+# LangGraph, the LLM/Telegram stacks and the summary/filtering modules are imported
+# where they are used, so runs that only fetch articles don't pay for loading them
+if TYPE_CHECKING:
+    from langgraph.graph.state import CompiledStateGraph
+    from search.agent import SearchAgent
 
 # Load environment variables
-load_dotenv()
+load_env_once()
+
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(module)s:%(funcName)s:%(lineno)d - %(message)s"
-)
+# Define the state for our workflow.
+# Articles are deliberately kept out of the state: nodes read and write them through
+# the database, so state transitions never copy or serialize article lists.
+# Nodes return only the keys they change and LangGraph merges them into the state,
+# so every key is optional and is read with state.get().
+def _keep_first_error(current: str | None, update: str | None) -> str | None:
+    """Merge error updates from parallel nodes, keeping the first error reported."""
+    return current or update
 
 
-# Define the state for our workflow
-class DigestState(TypedDict):
-    error: str | None
+class DigestState(TypedDict, total=False):
+    # Fetch and summary branches run in parallel and may both report an error in the same step
+    error: Annotated[str | None, _keep_first_error]
+    summary_text: str | None
 
 
-def fetch_articles_node(state: DigestState) -> DigestState:
+async def fetch_articles_node(state: DigestState) -> DigestState:
     """Fetch articles from all configured sources and store them to database."""
     logging.info("Fetching and storing articles...")
     try:
-        # Fetch articles from all sources
-        articles = load_all_articles(SOURCES_CONFIG_PATH)
+        # Store each source's articles while the remaining sources are still being fetched
+        total_articles = 0
+        async for articles in load_article_batches(SOURCES_CONFIG_PATH):
+            await asyncio.to_thread(article_storage.save, articles, DATABASE_CONFIG_PATH)
+            total_articles += len(articles)
         
-        # Store articles to database
-        article_storage.save(articles, DATABASE_CONFIG_PATH)
-        
-        return state
+        logging.info(f"Stored {total_articles} fetched articles")
+        return {}
     except Exception as e:
         logging.error(f"Failed to fetch and store articles: {e}")
         return {
-            **state,
             "error": f"Failed to fetch and store articles: {e}"
         }
 
 
-def delivery_condition_router(state: DigestState) -> str:
-    """Conditional function to determine if delivery should run."""
+def _is_delivery_due() -> bool:
+    """Check if the delivery time is reached and no digest was delivered today."""
     try:
-        if state.get("error"):
-            return "END"
-            
         # Load delivery config to get the delivery time
         delivery_config = load_config(DELIVERY_CONFIG_PATH)
         delivery_time_utc = delivery_config["delivery"]["delivery_time_utc"]
         
-        # Fetch the last delivery to check timing
-        latest_delivery = get_latest_delivery(DATABASE_CONFIG_PATH)
-        last_datetime = latest_delivery.delivered_at if latest_delivery else None
+        # Cheapest check first: before the delivery time the database isn't queried at all
+        if not is_search_time_reached(delivery_time_utc):
+            logging.info(f"Current time is before delivery time {delivery_time_utc} UTC, skipping...")
+            return False
         
-        if should_run_delivery(last_datetime, delivery_time_utc):
-            return "deliver"
-        else:
-            return "END"
+        # Fetch only the last delivery time, the delivered content isn't needed here
+        last_datetime = get_latest_delivery_datetime(DATABASE_CONFIG_PATH)
+        
+        return should_run_delivery(last_datetime, delivery_time_utc)
         
     except Exception as e:
         logging.error(f"Failed to check delivery conditions: {e}")
-        return "END"
+        return False
 
 
 def _get_fresh_articles() -> List[Article]:
@@ -91,13 +94,24 @@ def _get_fresh_articles() -> List[Article]:
     return fresh_articles
 
 
-def _make_summary() -> str | None:
+@functools.lru_cache(maxsize=1)
+def _get_search_agent(config_path: str) -> "SearchAgent":
+    """Create the search agent once and reuse it, along with its chat model and SerpAPI client."""
+    from search.agent import SearchAgent
+    return SearchAgent(config_path)
+
+
+async def _make_summary() -> str | None:
     """Private function to create and save a new summary."""
     logging.info("Making new summary...")
+    from models.search_summary import SearchSummary
+    from storage.summary_storage import save_search_summary
+    from storage.search_result_storage import save_search_results
+
     try:
         # Search for AI agent news
-        search_agent = SearchAgent(SEARCH_AGENT_CONFIG_PATH)
-        search_results = search_agent.search_all_queries()
+        search_agent = _get_search_agent(SEARCH_AGENT_CONFIG_PATH)
+        search_results = await search_agent.search_all_queries_async()
         
         if not search_results:
             logging.warning("No search results found")
@@ -105,10 +119,11 @@ def _make_summary() -> str | None:
         
         # Save search results to database
         logging.info(f"Saving {len(search_results)} search results to database...")
-        save_search_results(search_results, DATABASE_CONFIG_PATH)
+        # This runs alongside fetch_articles, so blocking work stays off the event loop
+        await asyncio.to_thread(save_search_results, search_results, DATABASE_CONFIG_PATH)
         
         # Summarize search results
-        summary_text = search_agent.summarize_all_results(search_results)
+        summary_text = await search_agent.summarize_all_results_async(search_results)
         
         if not summary_text:
             logging.warning("No summary generated")
@@ -116,7 +131,7 @@ def _make_summary() -> str | None:
         
         # Save summary to database
         search_summary = SearchSummary(summary_text=summary_text)
-        save_search_summary(search_summary, DATABASE_CONFIG_PATH)
+        await asyncio.to_thread(save_search_summary, search_summary, DATABASE_CONFIG_PATH)
         
         logging.info("New summary made and saved successfully")
         return summary_text
@@ -125,21 +140,33 @@ def _make_summary() -> str | None:
         return None
 
 
-def deliver_digest_node(state: DigestState) -> DigestState:
-    """Score articles, make summary, and deliver digest via Telegram."""
+async def make_summary_node(state: DigestState) -> DigestState:
+    """Search the web and make a new summary while articles are being fetched."""
+    summary_text = await _make_summary()
+    return {
+        "summary_text": summary_text
+    }
+
+
+async def deliver_digest_node(state: DigestState) -> DigestState:
+    """Score articles and deliver digest via Telegram, once articles are fetched and the summary is made."""
+    # Skip delivery when fetching articles failed or no summary was made,
+    # before the delivery stack is imported
+    if state.get("error") or not state.get("summary_text"):
+        return {}
+    
     logging.info("Processing and delivering digest...")
+    from processing import scoring
+    from processing.filtering import filter_top_articles
+    from processing.post_creator import PostCreator
+    from delivery import telegram
+
     try:
-        if state.get("error"):
-            return state
-        
-        # Step 1: Make summary using private function
-        summary_text = _make_summary()
-        if not summary_text:
-            return state
+        # Step 1: The summary was made in parallel with fetching articles
+        summary_text = state.get("summary_text")
 
         # Step 2: Get fresh articles based on articles_freshness
         fresh_articles = _get_fresh_articles()
-        logging.info(f"Found {len(fresh_articles)} fresh articles")
         
         # Step 3: Score articles for relevance
         logging.info("Scoring content...")
@@ -159,61 +186,70 @@ def deliver_digest_node(state: DigestState) -> DigestState:
         
         # Step 7: Deliver digest via Telegram
         logging.info("Delivering digest...")
-        message_id = telegram.send(post_text)
+        try:
+            message_id = await telegram.send_async(post_text)
+        finally:
+            # This is the run's only send; close the bot's connections before the loop ends
+            await telegram.close()
         
         # Step 8: Save delivery record
         delivery = Delivery(content=post_text, origin_message_id=str(message_id))
         save_delivery(delivery, DATABASE_CONFIG_PATH)
         
-        return state
+        return {}
     except Exception as e:
         logging.error(f"Failed to process and deliver digest: {e}")
         return {
-            **state,
             "error": f"Failed to process and deliver digest: {e}"
         }
 
 
-def _create_digest_workflow() -> StateGraph:
+def _create_digest_workflow() -> "CompiledStateGraph":
     """Create the LangGraph workflow for the digest pipeline."""
+    from langgraph.graph import StateGraph, START, END
+
     workflow = StateGraph(DigestState)
     
     # Add nodes
     workflow.add_node("fetch_articles", fetch_articles_node)
+    workflow.add_node("make_summary", make_summary_node)
     workflow.add_node("deliver", deliver_digest_node)
     
-    # Add edges
+    # Add edges: fetching articles and making the summary don't depend on each other,
+    # so they fan out from START and fan back in directly at deliver
     workflow.add_edge(START, "fetch_articles")
-    
-    # Conditional edge: fetch_articles -> deliver OR END
-    workflow.add_conditional_edges(
-        "fetch_articles",
-        delivery_condition_router,
-        {
-            "deliver": "deliver",
-            "END": END
-        }
-    )
+    workflow.add_edge(START, "make_summary")
+    workflow.add_edge(["fetch_articles", "make_summary"], "deliver")
     
     workflow.add_edge("deliver", END)
     
     return workflow.compile()
 
 
+@functools.lru_cache(maxsize=1)
+def _get_digest_workflow() -> "CompiledStateGraph":
+    """Compile the digest workflow once and reuse it for every run in this process."""
+    return _create_digest_workflow()
+
+
 def main() -> None:
+    init_logging()
     logging.info("AI Agent Digest started")
 
     try:
-        # Create and run the workflow with LangSmith tracing
-        workflow = _create_digest_workflow()
-        
         # Initialize state
-        initial_state = DigestState(
-            error=None
-        )
+        initial_state = DigestState()
         
-        # Run the workflow
-        result = workflow.invoke(initial_state)
+        if _is_delivery_due():
+            # Create and run the workflow with LangSmith tracing
+            workflow = _get_digest_workflow()
+            
+            # Run the workflow (the delivery node is async, so it runs on an event loop)
+            result = asyncio.run(workflow.ainvoke(initial_state))
+        else:
+            # Outside the delivery window only articles are fetched, so the
+            # workflow and the delivery stack are never built or imported
+            result = asyncio.run(fetch_articles_node(initial_state))
         
         # Check for errors
         if result.get("error"):
@@ -4,12 +4,15 @@ Article model for RSS feed articles.
 
 from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, ConfigDict, HttpUrl, Field
 
 
 class Article(BaseModel):
     """Represents an article from an RSS feed or news source."""
     
+    # Articles are never modified after creation; derived articles are built as new instances
+    model_config = ConfigDict(frozen=True)
+    
     guid: str = Field(..., description="Unique identifier for the article")
     source: str = Field(..., description="Source website or feed name")
     title: str = Field(..., description="Title of the article")
@@ -4,10 +4,14 @@ SearchResult model for individual search results.
 
 from typing import Optional
 from datetime import datetime
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import HttpUrl, Field
+from pydantic.dataclasses import dataclass
 
 
-class SearchResult(BaseModel):
+# A validated dataclass with __slots__: fields are still checked on creation,
+# but instances carry no per-object __dict__
+@dataclass(slots=True, frozen=True)
+class SearchResult:
     """Represents a single search result from a web search."""
     
     title: str = Field(..., description="Title of the search result")
@@ -2,7 +2,9 @@
 Article filtering module for selecting top articles based on relevance scores.
 """
 
+import heapq
 import logging
+from operator import itemgetter
 from typing import List
 from models.article import ScoredArticle
 
@@ -28,25 +30,41 @@ def filter_top_articles(scored_articles: List[ScoredArticle]) -> List[ScoredArti
         logging.warning("No articles to filter")
         return []
     
-    # Filter articles with valid scores and sort by score descending
-    valid_articles = [article for article in scored_articles if article.relevance_score is not None]
-    sorted_articles = sorted(valid_articles, key=lambda x: x.relevance_score, reverse=True)
+    # Single pass over the articles: skip missing scores, count high relevance (score > 80)
+    # and keep the 5 best in a min-heap. Entries are (score, -position, article), so among
+    # equal scores the later article is evicted first, as a stable sort would order them.
+    heap = []
+    valid_count = 0
+    high_relevance_count = 0
+    for position, article in enumerate(scored_articles):
+        score = article.relevance_score
+        if score is None:
+            continue
+        valid_count += 1
+        if score > 80:
+            high_relevance_count += 1
+        entry = (score, -position, article)
+        if len(heap) < 5:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
     
-    if not sorted_articles:
+    if not valid_count:
         logging.warning("No articles with valid relevance scores")
         return []
     
-    # Check if there are at least 5 articles with high relevance (score > 80)
-    high_relevance_articles = [article for article in sorted_articles if article.relevance_score > 80]
-    
-    if len(high_relevance_articles) >= 5:
+    if high_relevance_count >= 5:
         # At least 5 articles have high relevance, take top 5
-        top_articles = sorted_articles[:5]
-        logging.info(f"At least 5 articles have high relevance (>80), selected top {len(top_articles)} articles")
+        top_count = 5
+        reason = "At least 5 articles have high relevance (>80)"
     else:
         # Less than 5 articles have high relevance, take top 3
-        top_articles = sorted_articles[:3]
-        logging.info(f"Less than 5 articles have high relevance (>80), selected top {len(top_articles)} articles")
+        top_count = 3
+        reason = "Less than 5 articles have high relevance (>80)"
+    
+    heap.sort(key=itemgetter(0, 1), reverse=True)
+    top_articles = [article for _, _, article in heap[:top_count]]
+    logging.info(f"{reason}, selected top {len(top_articles)} articles")
     
     # Log the selected articles
     for i, article in enumerate(top_articles, 1):
@@ -4,7 +4,7 @@ Post creator module for generating engaging social media posts from articles.
 
 import html
 import logging
-from typing import List
+from typing import Any, Dict, List, Optional
 from langchain.chat_models import init_chat_model
 from utils.config import load_config
 from models.article import ScoredArticle
@@ -13,9 +13,16 @@ from models.article import ScoredArticle
 class PostCreator:
     """Creates engaging social media posts from articles using LLM."""
     
-    def __init__(self, config_path: str):
-        """Initialize the post creator with configuration."""
-        self.config = load_config(config_path)
+    def __init__(self, config_path: Optional[str] = None, *, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the post creator with configuration.
+        An already loaded config dict can be passed instead of a config path.
+        """
+        if config is None:
+            if config_path is None:
+                raise ValueError("Either config_path or config is required")
+            config = load_config(config_path)
+        self.config = config
         
         # Initialize LangChain chat model
         chat_model_config = self.config["post_creator"]["chat_model"]
@@ -1,6 +1,8 @@
+import hashlib
 import logging
 import os
-from typing import List, Optional
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional
 from pydantic import BaseModel, Field
 from langchain.chat_models import init_chat_model
 from utils.config import load_config
@@ -14,6 +16,17 @@ class RelevanceScore(BaseModel):
     reasoning: str = Field(..., description="Brief explanation for the score")
 
 
+def score_statistics(scores: np.ndarray) -> tuple[float, float]:
+    """Return the average score and the percentage of high relevance (70+) scores in one vectorized pass."""
+    high_relevance_count = np.count_nonzero(scores >= 70)
+    return float(scores.mean()), high_relevance_count / scores.size * 100
+
+
+def _to_scored_article(article: Article, score: Optional[int], reasoning: Optional[str]) -> ScoredArticle:
+    """Copy an already validated Article into a ScoredArticle without validating its fields again."""
+    return ScoredArticle.model_construct(**{**dict(article), "relevance_score": score, "reasoning": reasoning})
+
+
 class RelevanceScorer:
     """Scorer for evaluating article relevance to AI agent content using LLM."""
     
@@ -37,50 +50,55 @@ class RelevanceScorer:
         # Configure structured output
         self.structured_model = self.chat_model.with_structured_output(RelevanceScore)
         
+        self.max_concurrent_requests = scoring_config.get("max_concurrent_requests", 10)
         self.scoring_prompt = scoring_config["scoring_prompt"]
         self.system_message = scoring_config["system_message"]
     
     
-    def _score_article(self, article: Article, relevance_text: str) -> tuple[Optional[int], Optional[str]]:
-        """Score a single article for relevance to AI agent content."""
-        try:
-            # Prepare article data for scoring
-            article_data = {
-                "title": article.title,
-                "summary": article.summary or "No summary available",
-                "source": article.source,
-                "relevance_text": relevance_text or "No reference context available"
-            }
-            
-            # Format the scoring prompt
-            prompt = self.scoring_prompt.format(**article_data)
-            
-            # Get structured score from LLM
-            messages = [
-                {"role": "system", "content": self.system_message},
-                {"role": "user", "content": prompt}
-            ]
-            
-            response = self.structured_model.invoke(messages)
-            
-            if response and hasattr(response, 'score'):
-                score = response.score
-                reasoning = getattr(response, 'reasoning', 'No reasoning provided')
-                logging.debug(f"Scored article '{article.title}' with score: {score} - {reasoning}")
-                return score, reasoning
-            else:
-                logging.warning(f"Failed to get valid structured response for article '{article.title}'")
-                return None, None
-                
-        except Exception as e:
-            logging.error(f"Failed to score article '{article.title}': {e}")
+    def _build_messages(self, article: Article, relevance_text: str) -> List[dict]:
+        """Build the chat messages asking to score a single article."""
+        # Prepare article data for scoring
+        article_data = {
+            "title": article.title,
+            "summary": article.summary or "No summary available",
+            "source": article.source,
+            "relevance_text": relevance_text or "No reference context available"
+        }
+        
+        # Format the scoring prompt
+        prompt = self.scoring_prompt.format(**article_data)
+        
+        return [
+            {"role": "system", "content": self.system_message},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _parse_response(self, article: Article, response: Any) -> tuple[Optional[int], Optional[str]]:
+        """Extract the score and reasoning from a structured LLM response."""
+        if response and hasattr(response, 'score'):
+            score = response.score
+            reasoning = getattr(response, 'reasoning', 'No reasoning provided')
+            logging.debug(f"Scored article '{article.title}' with score: {score} - {reasoning}")
+            return score, reasoning
+        else:
+            logging.warning(f"Failed to get valid structured response for article '{article.title}'")
             return None, None
     
-    def score_articles(self, articles: List[Article], relevance_text: str) -> List[ScoredArticle]:
+    def _prompt_key(self, messages: List[dict]) -> bytes:
+        """Digest of the chat messages; the messages hold everything the score depends on."""
+        digest = hashlib.blake2b(digest_size=16)
+        for message in messages:
+            digest.update(message["content"].encode())
+            digest.update(b"\x1f")
+        return digest.digest()
+    
+    def score_articles(self, articles: Iterable[Article], relevance_text: str) -> List[ScoredArticle]:
         """Score multiple articles for relevance to AI agent content."""
-        logging.info(f"Scoring {len(articles)} articles for relevance...")
+        logging.info("Scoring articles for relevance...")
         
-        scored_articles = []
+        scored_articles: List[Optional[ScoredArticle]] = []
+        # Articles still to be scored, grouped by prompt: each group needs one request
+        pending: Dict[bytes, tuple[List[dict], List[tuple[int, Article]]]] = {}
         skipped_count = 0
         
         for article in articles:
@@ -90,61 +108,59 @@ class RelevanceScorer:
                 skipped_count += 1
                 
                 # Convert existing Article to ScoredArticle preserving existing score
-                scored_article = ScoredArticle(
-                    guid=article.guid,
-                    source=article.source,
-                    title=article.title,
-                    link=article.link,
-                    summary=article.summary,
-                    author=article.author,
-                    categories=article.categories,
-                    published_at=article.published_at,
-                    fetched_at=article.fetched_at,
-                    posted=article.posted,
-                    relevance_score=article.relevance_score,
-                    reasoning=getattr(article, 'reasoning', None)  # Preserve existing reasoning if available
-                )
-                scored_articles.append(scored_article)
+                # and reasoning if available
+                scored_articles.append(_to_scored_article(article, article.relevance_score, getattr(article, 'reasoning', None)))
                 continue
             
-            score, reasoning = self._score_article(article, relevance_text)
-            
-            # Create a ScoredArticle with the relevance score and reasoning
-            scored_article = ScoredArticle(
-                guid=article.guid,
-                source=article.source,
-                title=article.title,
-                link=article.link,
-                summary=article.summary,
-                author=article.author,
-                categories=article.categories,
-                published_at=article.published_at,
-                fetched_at=article.fetched_at,
-                posted=article.posted,
-                relevance_score=score,
-                reasoning=reasoning
+            # Articles with identical content (e.g. a story repeated in a feed) produce the
+            # same prompt and share one request; each keeps its position until the batch
+            # response arrives
+            messages = self._build_messages(article, relevance_text)
+            pending.setdefault(self._prompt_key(messages), (messages, []))[1].append((len(scored_articles), article))
+            scored_articles.append(None)
+        
+        if pending:
+            # Send one scoring request per distinct prompt in one batch; the requests run
+            # concurrently and a failed request comes back as its exception instead of
+            # failing the batch
+            responses = self.structured_model.batch(
+                [messages for messages, _ in pending.values()],
+                config={"max_concurrency": self.max_concurrent_requests},
+                return_exceptions=True
             )
-            scored_articles.append(scored_article)
+            
+            for (_, group), response in zip(pending.values(), responses):
+                first_article = group[0][1]
+                if isinstance(response, Exception):
+                    logging.error(f"Failed to score article '{first_article.title}': {response}")
+                    score, reasoning = None, None
+                else:
+                    score, reasoning = self._parse_response(first_article, response)
+                
+                # Create a ScoredArticle with the relevance score and reasoning
+                for position, article in group:
+                    scored_articles[position] = _to_scored_article(article, score, reasoning)
         
         # Log scoring statistics
-        valid_scores = [a.relevance_score for a in scored_articles if a.relevance_score is not None]
-        if valid_scores:
-            avg_score = sum(valid_scores) / len(valid_scores)
-            high_relevance = len([s for s in valid_scores if s >= 70])
-            high_relevance_percentage = high_relevance / len(valid_scores) * 100
-            logging.info(f"Scoring complete. Processed: {len(articles)}, Skipped: {skipped_count}, New scores: {len(valid_scores) - skipped_count}. Average score: {avg_score:.1f}, High relevance (70+): {high_relevance_percentage:.1f}%")
+        valid_scores = np.fromiter(
+            (a.relevance_score for a in scored_articles if a.relevance_score is not None),
+            dtype=np.int16
+        )
+        if valid_scores.size:
+            avg_score, high_relevance_percentage = score_statistics(valid_scores)
+            logging.info(f"Scoring complete. Processed: {len(scored_articles)}, Skipped: {skipped_count}, New scores: {valid_scores.size - skipped_count}. Average score: {avg_score:.1f}, High relevance (70+): {high_relevance_percentage:.1f}%")
         else:
             logging.warning("No valid scores generated")
             
         return scored_articles
 
 
-def assign_relevance_score(articles: List[Article], relevance_text: str) -> List[ScoredArticle]:
+def assign_relevance_score(articles: Iterable[Article], relevance_text: str) -> List[ScoredArticle]:
     """
     Calculate relevance scores for AI Agent content using LLM-based scoring.
     
     Args:
-        articles: List of articles to score
+        articles: Articles to score (any iterable, consumed once)
         relevance_text: Summary text used as context for scoring (trending AI agent news)
         
     Returns:
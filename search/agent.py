@@ -2,17 +2,26 @@
 Search agent module for performing web searches using SerpAPI and OpenAI summarization.
 """
 
+import asyncio
+import io
 import logging
 import os
-from typing import List
-from datetime import datetime
+import sys
+from operator import attrgetter
+from typing import Any, Dict, List, Optional
 
-from langchain_community.utilities import SerpAPIWrapper
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
 from langchain.chat_models import init_chat_model
 from utils.config import load_config
 from models.search_result import SearchResult
+from utils.logging_setup import init_logging
 from utils.constants import SEARCH_AGENT_CONFIG_PATH
 
+SERPAPI_SEARCH_URL = "https://serpapi.com/search"
+SERPAPI_TIMEOUT_SECONDS = 30
+
 
 class SearchAgent:
     """Agent for performing web searches and generating summaries."""
@@ -36,39 +45,90 @@ class SearchAgent:
             temperature=chat_model_config["temperature"]
         )
         
-        # Initialize SerpAPI wrapper through LangChain
+        # SerpAPI request parameters shared by every query
         search_config = self.config["search_agent"]
-        params = {
+        self.serpapi_params = {
+            "engine": "google",
             "num": search_config["results_per_query"],
-            **search_config.get("serpapi_params", {})
+            **search_config.get("serpapi_params", {}),
+            "api_key": self.serpapi_key,
+            "output": "json"
         }
-            
-        self.serpapi_wrapper = SerpAPIWrapper(
-            serpapi_api_key=self.serpapi_key,
-            params=params
-        )
+        
+        # Keep-alive HTTP session for the synchronous search() path, which only the
+        # command-line demo and tests use; created on first use, released by close()
+        self._http_session: Optional[requests.Session] = None
+    
+    def _get_http_session(self) -> requests.Session:
+        """Return the pooled session for synchronous searches, so queries after the first reuse the TLS connection."""
+        if self._http_session is None:
+            self._http_session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+            self._http_session.mount("https://", adapter)
+        return self._http_session
+    
+    def close(self) -> None:
+        """Close the synchronous HTTP session, if one was opened."""
+        if self._http_session is not None:
+            self._http_session.close()
+            self._http_session = None
+    
+    def _get_request_params(self, query: str) -> Dict[str, str]:
+        """Build the SerpAPI query string parameters for a query."""
+        return {key: str(value) for key, value in {**self.serpapi_params, "q": query}.items()}
+    
+    def _to_search_results(self, results: Dict[str, Any]) -> List[SearchResult]:
+        """Build SearchResult objects from a raw SerpAPI response."""
+        search_results = []
+        
+        raw_results = results.get("news_results", [])
+        
+        for result in raw_results:                
+            search_results.append(SearchResult(
+                title=result.get("title", ""),
+                snippet=result.get("snippet", ""),
+                # A handful of outlets publish most results, so their names are shared
+                source=sys.intern(result.get("source", "")),
+                published_date=result.get("date", ""),
+                link=result.get("link", "")
+            ))
+        
+        return search_results
     
     def search(self, query: str) -> List[SearchResult]:
         """Perform a web search for the given query."""
         logging.info(f"Searching for: {query}")
         
         try:
-            # Use SerpAPI wrapper to get structured results
-            results = self.serpapi_wrapper.results(query)
+            # Request structured results over the shared session
+            response = self._get_http_session().get(SERPAPI_SEARCH_URL, params=self._get_request_params(query), timeout=SERPAPI_TIMEOUT_SECONDS)
+            response.raise_for_status()
+            results = response.json()
+            
+            search_results = self._to_search_results(results)
+                
+            logging.info(f"Found {len(search_results)} results for query: {query}")
+            return search_results
             
-            search_results = []
+        except Exception as e:
+            logging.error(f"Search failed for query '{query}': {e}")
+            return []
+    
+    async def _fetch_results_async(self, session: aiohttp.ClientSession, query: str) -> Dict[str, Any]:
+        """Request raw SerpAPI results for a query over the shared HTTP session."""
+        async with session.get(SERPAPI_SEARCH_URL, params=self._get_request_params(query)) as response:
+            response.raise_for_status()
+            return await response.json()
+    
+    async def _search_async(self, session: aiohttp.ClientSession, query: str) -> List[SearchResult]:
+        """Perform a web search for the given query without blocking the event loop."""
+        logging.info(f"Searching for: {query}")
+        
+        try:
+            results = await self._fetch_results_async(session, query)
             
-            raw_results = results.get("news_results", [])
+            search_results = self._to_search_results(results)
             
-            for result in raw_results:                
-                search_results.append(SearchResult(
-                    title=result.get("title", ""),
-                    snippet=result.get("snippet", ""),
-                    source=result.get("source", ""),
-                    published_date=result.get("date", ""),
-                    link=result.get("link", "")
-                ))
-                
             logging.info(f"Found {len(search_results)} results for query: {query}")
             return search_results
             
@@ -76,39 +136,90 @@ class SearchAgent:
             logging.error(f"Search failed for query '{query}': {e}")
             return []
     
+    def _unique_by_link(self, results: List[SearchResult]) -> List[SearchResult]:
+        """Drop results whose link was already returned by an earlier query, keeping order."""
+        seen = set()
+        unique_results = []
+        for result in results:
+            link = str(result.link)
+            if link not in seen:
+                seen.add(link)
+                unique_results.append(result)
+        return unique_results
+    
     def search_multiple_queries(self, queries: List[str]) -> List[SearchResult]:
-        """Search for multiple queries and return combined results."""
+        """Search for multiple queries and return combined results without duplicate links."""
         all_results = []
         
-        for query in queries:
+        # Each distinct query is searched once, in its original order
+        for query in dict.fromkeys(queries):
             results = self.search(query)
             all_results.extend(results)
             
-        return all_results
+        return self._unique_by_link(all_results)
     
-    def summarize_results(self, results: List[SearchResult], query: str) -> str:
-        """Generate a summary of search results using LangChain chat model."""
-        if not results:
-            return f"No results found for query: {query}"
-            
-        # Prepare content for summarization
-        content_pieces = []
+    async def search_multiple_queries_async(self, queries: List[str]) -> List[SearchResult]:
+        """Search for multiple queries concurrently and return combined results in query order, without duplicate links."""
+        max_concurrency = self.config["search_agent"].get("max_concurrent_searches", 8)
+        
+        # One session for all queries, so connections are reused; the connector limit
+        # bounds how many requests are in flight at once; each request gets the same
+        # timeout as the synchronous path instead of aiohttp's 5 minute default
+        connector = aiohttp.TCPConnector(limit=max_concurrency)
+        timeout = aiohttp.ClientTimeout(total=SERPAPI_TIMEOUT_SECONDS)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            results_per_query = await asyncio.gather(*(self._search_async(session, query) for query in dict.fromkeys(queries)))
+        
+        return self._unique_by_link([result for results in results_per_query for result in results])
+    
+    def _build_summary_messages(self, results: List[SearchResult], query: str) -> List[dict]:
+        """Build the chat messages asking to summarize the given search results."""
+        # Prepare content for summarization, skipping repeats of the same story
+        # (several queries often return it) so they don't take up prompt slots.
+        # Entries are written into one buffer instead of building a string per result.
+        buffer = io.StringIO()
+        write = buffer.write
+        seen = set()
+        count = 0
         max_results = self.config["search_agent"]["max_results_for_summary"]
-        for i, result in enumerate(results[:max_results], 1):
-            content_pieces.append(f"{i}. {result.title}\n   {result.snippet}\n   Source: {result.source}\n")
+        for result in results:
+            if count == max_results:
+                break
+            key = (result.title.lower(), result.source)
+            if key in seen:
+                continue
+            seen.add(key)
+            count += 1
+            if count > 1:
+                write("\n")
+            write(str(count))
+            write(". ")
+            write(result.title)
+            write("\n   ")
+            write(result.snippet)
+            write("\n   Source: ")
+            write(result.source)
+            write("\n")
             
-        content_text = "\n".join(content_pieces)
+        content_text = buffer.getvalue()
         
         prompt = self.config["search_agent"]["summary_prompt"].format(
             query=query,
             content_text=content_text
         )
         
+        return [
+            {"role": "system", "content": self.config["search_agent"]["system_message"]},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def summarize_results(self, results: List[SearchResult], query: str) -> str:
+        """Generate a summary of search results using LangChain chat model."""
+        if not results:
+            return f"No results found for query: {query}"
+        
         try:
-            messages = [
-                {"role": "system", "content": self.config["search_agent"]["system_message"]},
-                {"role": "user", "content": prompt}
-            ]
+            messages = self._build_summary_messages(results, query)
             
             response = self.chat_model.invoke(messages)
             summary = response.content.strip()
@@ -120,6 +231,24 @@ class SearchAgent:
             logging.error(f"Failed to generate summary for query '{query}': {e}")
             return f"Summary generation failed for query: {query}"
     
+    async def summarize_results_async(self, results: List[SearchResult], query: str) -> str:
+        """Generate a summary of search results without blocking the event loop."""
+        if not results:
+            return f"No results found for query: {query}"
+        
+        try:
+            messages = self._build_summary_messages(results, query)
+            
+            response = await self.chat_model.ainvoke(messages)
+            summary = response.content.strip()
+            
+            logging.info(f"Generated summary for query: {query}")
+            return summary
+            
+        except Exception as e:
+            logging.error(f"Failed to generate summary for query '{query}': {e}")
+            return f"Summary generation failed for query: {query}"
+    
     def get_all_queries(self) -> List[str]:
         """Get all search queries from configuration."""
         return self.config["search_agent"]["queries"]
@@ -134,6 +263,16 @@ class SearchAgent:
         
         return self.search_multiple_queries(queries)
     
+    async def search_all_queries_async(self) -> List[SearchResult]:
+        """Search for all configured queries concurrently and return combined results."""
+        queries = self.get_all_queries()
+        
+        if not queries:
+            logging.warning("No queries found in configuration")
+            return []
+        
+        return await self.search_multiple_queries_async(queries)
+    
     def get_combined_query(self) -> str:
         """Get combined query string for all configured queries."""
         queries = self.get_all_queries()
@@ -143,14 +282,16 @@ class SearchAgent:
         """Generate a summary of search results using all configured queries."""
         combined_query = self.get_combined_query()
         return self.summarize_results(results, combined_query)
+    
+    async def summarize_all_results_async(self, results: List[SearchResult]) -> str:
+        """Generate a summary of search results using all configured queries, asynchronously."""
+        combined_query = self.get_combined_query()
+        return await self.summarize_results_async(results, combined_query)
 
 
 # to test locally
 if __name__ == "__main__":
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-    )
+    init_logging()
 
     try:
         # Initialize search agent
@@ -158,18 +299,25 @@ if __name__ == "__main__":
         
         # Search for "AI Agents"
         query = "AI Agents"
-        results = search_agent.search(query)
+        try:
+            results = search_agent.search(query)
+        finally:
+            search_agent.close()
         
         # Log detailed results
         logging.info(f"Search results for '{query}':")
         logging.info(f"Total results found: {len(results)}")
         
-        # Sort results by published_date in descending order (newest first)
-        sorted_results = sorted(results, key=lambda x: x.published_date or datetime.min, reverse=True)
+        # Sort results by published_date in descending order, results without a date last;
+        # only dated results are sorted, with the key extracted once per result
+        dated_results = [result for result in results if result.published_date]
+        undated_results = [result for result in results if not result.published_date]
+        dated_results.sort(key=attrgetter("published_date"), reverse=True)
+        sorted_results = dated_results + undated_results
         
-        # Log title and posted date for each result
+        # Log title and posted date for each result (SerpAPI returns dates as display strings)
         for i, result in enumerate(sorted_results, 1):
-            published_date_str = result.published_date.strftime("%Y-%m-%d %H:%M:%S") if result.published_date else "No date"
+            published_date_str = result.published_date or "No date"
             logging.info(f"{i}. {result.title} - Posted: {published_date_str}")
         
     except (FileNotFoundError, ValueError) as e:
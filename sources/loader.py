@@ -1,9 +1,13 @@
+import asyncio
 import feedparser
+from datetime import datetime, timezone
 import logging
-from typing import List, Dict
+import sys
+from typing import Any, AsyncIterator, Dict, List
 from dateutil import parser as date_parser
 from models.article import Article
 from utils.config import get_sources_config
+from utils.logging_setup import init_logging
 from utils.constants import SOURCES_CONFIG_PATH
 
 logger = logging.getLogger(__name__)
@@ -21,66 +25,104 @@ def fetch_rss_articles(url: str, source_name: str) -> List[Article]:
         logger.error(f"No entries found in feed {url}")
         return []
 
+    # Bind per-entry lookups to locals once; debug logging is checked once and
+    # formatted lazily, so nothing is formatted per entry when it is disabled
+    make_article = Article
+    parse_date = date_parser.parse
+    intern = sys.intern
+    # Every entry of the feed shares one source string, and categories repeat across
+    # entries, so interned copies are shared instead of held once per article
+    source_name = intern(source_name) if source_name else source_name
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
     articles = []
+    append = articles.append
     for entry in feed.entries:
-        # Parse published date if available
+        # Parse published date if available; feedparser has usually parsed it already
+        # (normalized to UTC), so dateutil is only needed for dates it couldn't handle
         published_at = None
-        if hasattr(entry, 'published'):
+        published_parsed = entry.get('published_parsed')
+        if published_parsed:
+            published_at = datetime(*published_parsed[:6], tzinfo=timezone.utc)
+        elif 'published' in entry:
             try:
-                published_at = date_parser.parse(entry.published)
+                published_at = parse_date(entry.published)
             except (ValueError, TypeError):
                 logger.warning(f"Could not parse published date: {entry.published}")
         
         # Create Article object
-        article = Article(
-            guid=getattr(entry, "id", entry.link),  # fallback to link if no id
+        article = make_article(
+            guid=entry.get("id", entry.link),  # fallback to link if no id
             source=source_name,
             title=entry.title,
             link=entry.link,
-            summary=getattr(entry, "summary", None),
-            author=getattr(entry, "author", None),
-            categories=[tag.term for tag in getattr(entry, "tags", [])],
+            summary=entry.get("summary"),
+            author=entry.get("author"),
+            categories=[intern(tag.term) if tag.term else tag.term for tag in entry.get("tags", ())],
             published_at=published_at
         )
-        articles.append(article)
-        logger.debug(f"Fetched article: {article.title}")
+        append(article)
+        if debug_enabled:
+            logger.debug("Fetched article: %s", article.title)
 
     logger.info(f"Fetched {len(articles)} articles from {url}.")
     return articles
 
 
-def load_all_articles(config_path: str) -> List[Article]:
-    """
-    Load articles from all enabled sources defined in the config.
-    Returns a flat list of article dictionaries.
-    """
-    config = get_sources_config(config_path)
-    all_articles: List[Article] = []
-
+def _get_rss_sources(config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the enabled RSS sources from the config, warning about unsupported ones."""
+    rss_sources = []
     for source in config["sources"]:
         if not source.get("enabled", False):
             continue
 
-        source_type = source.get("type")
-        url = source.get("url")
-        source_name = source.get("name")
-
-        if source_type == "rss" and url:
-            articles = fetch_rss_articles(url, source_name)
-            all_articles.extend(articles)
+        if source.get("type") == "rss" and source.get("url"):
+            rss_sources.append(source)
         else:
             logger.warning(f"Unsupported source type or missing URL: {source}")
 
+    return rss_sources
+
+
+async def load_article_batches(config_path: str, max_concurrency: int = 8) -> AsyncIterator[List[Article]]:
+    """
+    Fetch all enabled sources concurrently and yield each source's articles as soon as
+    that source is done, so a batch can be stored while other feeds are still downloading.
+    """
+    config = get_sources_config(config_path)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(source: Dict[str, Any]) -> List[Article]:
+        async with semaphore:
+            return await asyncio.to_thread(fetch_rss_articles, source["url"], source.get("name"))
+
+    tasks = [asyncio.create_task(fetch(source)) for source in _get_rss_sources(config)]
+    try:
+        for completed in asyncio.as_completed(tasks):
+            yield await completed
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def load_all_articles(config_path: str, max_concurrency: int = 8) -> List[Article]:
+    """
+    Load articles from all enabled sources defined in the config and return them as one flat list.
+    Synchronous wrapper around load_article_batches that runs its own event loop, so it
+    must not be called from a running loop; iterate load_article_batches there instead.
+    """
+    async def collect() -> List[Article]:
+        return [article async for articles in load_article_batches(config_path, max_concurrency) for article in articles]
+
+    all_articles = asyncio.run(collect())
+
     logger.info(f"Total collected articles: {len(all_articles)}")
     return all_articles
 
 
 # to test locally
 if __name__ == "__main__":
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-    )
+    init_logging()
 
     try:
         articles = load_all_articles(SOURCES_CONFIG_PATH)
@@ -1,53 +1,66 @@
-import sqlite3
-from typing import List
+import itertools
+from operator import itemgetter
+from typing import Iterable, Iterator, List
 from datetime import datetime
 from models.article import Article
-from utils.config import get_database_file
+from utils.db import get_connection, transaction
 
-def save(articles: List[Article], config_path: str) -> None:
+# Rows written per transaction; keeps the shared connection free for other writers between batches
+SAVE_BATCH_SIZE = 500
+
+# Rows fetched from the cursor per call when reading articles
+FETCH_BATCH_SIZE = 1000
+
+
+def _unique_by_guid(articles: Iterable[Article]) -> Iterator[Article]:
+    """Yield each guid's first article only; later duplicates would be ignored by the insert anyway."""
+    seen = set()
+    for article in articles:
+        if article.guid not in seen:
+            seen.add(article.guid)
+            yield article
+
+
+def save(articles: Iterable[Article], config_path: str, batch_size: int = SAVE_BATCH_SIZE) -> None:
     """
-    Save a list of Article objects into the database using batch insertion.
+    Save Article objects into the database using batch insertion.
     Articles are deduplicated by guid (already primary key in schema).
+    Rows are built lazily and written in transactions of at most batch_size rows.
+    Duplicate guids are dropped before reaching SQLite, and each batch is inserted
+    in guid order so the primary key index is filled sequentially.
     """
-    if not articles:
-        return
-        
-    db_file = get_database_file(config_path)
-    conn = sqlite3.connect(db_file)
-    try:
-        cursor = conn.cursor()
-        
-        # Prepare data for batch insertion
-        batch_data = []
-        for article in articles:
-            batch_data.append((
-                article.guid,
-                article.source,
-                article.title,
-                str(article.link),
-                article.summary,
-                article.author,
-                ",".join(article.categories) if article.categories else None,
-                article.published_at.isoformat() if article.published_at else None,
-            ))
-        
-        # Execute batch insertion
-        cursor.executemany(
-            """
-            INSERT OR IGNORE INTO rss_entries
-            (guid, source, title, link, summary, author, categories, published_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            batch_data
+    rows = (
+        (
+            article.guid,
+            article.source,
+            article.title,
+            str(article.link),
+            article.summary,
+            article.author,
+            ",".join(article.categories) if article.categories else None,
+            article.published_at.isoformat() if article.published_at else None,
         )
-        conn.commit()
-    finally:
-        conn.close()
+        for article in _unique_by_guid(articles)
+    )
+    
+    while batch_data := sorted(itertools.islice(rows, batch_size), key=itemgetter(0)):
+        with transaction(config_path) as conn:
+            # Execute batch insertion
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO rss_entries
+                (guid, source, title, link, summary, author, categories, published_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                batch_data
+            )
 
 
 def get_articles_after(config_path: str, after_datetime: datetime) -> List[Article]:
     """
     Get articles with published_at later than the given datetime.
+    All rows are read before returning, so the shared connection is released
+    as soon as the query is done rather than held by a partly consumed iterator.
     
     Args:
         config_path: Path to the database configuration file
@@ -56,12 +69,10 @@ def get_articles_after(config_path: str, after_datetime: datetime) -> List[Artic
     Returns:
         List of Article objects published after the given datetime
     """
-    db_file = get_database_file(config_path)
-    conn = sqlite3.connect(db_file)
-    conn.row_factory = sqlite3.Row
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
+    articles: List[Article] = []
+    with get_connection(config_path) as conn:
+        # Plain tuples are unpacked positionally, in the SELECT column order
+        cursor = conn.execute(
             """
             SELECT guid, source, title, link, summary, author, categories, published_at, fetched_at, posted, relevance_score
             FROM rss_entries
@@ -71,79 +82,74 @@ def get_articles_after(config_path: str, after_datetime: datetime) -> List[Artic
             (after_datetime.isoformat(),)
         )
         
-        articles = []
-        for row in cursor.fetchall():
-            # Parse categories from comma-separated string
-            categories = row['categories'].split(',') if row['categories'] else []
-            
-            # Parse published_at datetime
-            published_at = None
-            if row['published_at']:
-                published_at = datetime.fromisoformat(row['published_at'].replace('Z', '+00:00'))
-            
-            # Parse fetched_at datetime
-            fetched_at = None
-            if row['fetched_at']:
-                fetched_at = datetime.fromisoformat(row['fetched_at'].replace('Z', '+00:00'))
-            
-            article = Article(
-                guid=row['guid'],
-                source=row['source'],
-                title=row['title'],
-                link=row['link'],
-                summary=row['summary'],
-                author=row['author'],
-                categories=categories,
-                published_at=published_at,
-                fetched_at=fetched_at,
-                posted=bool(row['posted']),
-                relevance_score=row['relevance_score']
-            )
-            articles.append(article)
+        # Bind per-row lookups to locals once; fromisoformat accepts a trailing 'Z'
+        # since Python 3.11, so stored timestamps are parsed without rewriting them
+        fromisoformat = datetime.fromisoformat
+        construct = Article.model_construct
+        append = articles.append
         
-        return articles
-    finally:
-        conn.close()
+        while rows := cursor.fetchmany(FETCH_BATCH_SIZE):
+            for guid, source, title, link, summary, author, categories, published_at, fetched_at, posted, relevance_score in rows:
+                # Rows were validated when the articles were fetched, so validation is skipped here
+                append(construct(
+                    guid=guid,
+                    source=source,
+                    title=title,
+                    link=link,
+                    summary=summary,
+                    author=author,
+                    # Parse categories from comma-separated string
+                    categories=categories.split(',') if categories else [],
+                    # Parse published_at and fetched_at datetimes
+                    published_at=fromisoformat(published_at) if published_at else None,
+                    fetched_at=fromisoformat(fetched_at) if fetched_at else None,
+                    posted=bool(posted),
+                    relevance_score=relevance_score
+                ))
+    
+    return articles
+
 
+# Rows per UPDATE ... FROM statement; two bound parameters per row stays far below
+# SQLite's bound parameter limit
+UPDATE_BATCH_SIZE = 500
 
-def update_relevance_scores(articles: List[Article], config_path: str) -> None:
+
+def update_relevance_scores(articles: Iterable[Article], config_path: str) -> None:
     """
     Update relevance scores for articles in the database.
+    Scores are applied with one UPDATE ... FROM (VALUES ...) statement per batch
+    instead of one UPDATE per article.
     
     Args:
-        articles: List of Article objects with relevance_score populated
+        articles: Article objects with relevance_score populated (any iterable, consumed once)
         config_path: Path to the database configuration file
     """
-    if not articles:
+    # Scored articles are turned into (score, guid) rows lazily, one batch at a time
+    rows = (
+        (article.relevance_score, article.guid)
+        for article in articles
+        if article.relevance_score is not None
+    )
+    
+    batch_data = list(itertools.islice(rows, UPDATE_BATCH_SIZE))
+    if not batch_data:
         return
-        
-    db_file = get_database_file(config_path)
-    conn = sqlite3.connect(db_file)
-    try:
-        cursor = conn.cursor()
-        
-        # Prepare data for batch update
-        batch_data = []
-        for article in articles:
-            if article.relevance_score is not None:
-                batch_data.append((
-                    article.relevance_score,
-                    article.guid
-                ))
-        
-        if not batch_data:
-            return
-        
-        # Execute batch update
-        cursor.executemany(
-            """
-            UPDATE rss_entries 
-            SET relevance_score = ?
-            WHERE guid = ?
-            """,
-            batch_data
-        )
-        conn.commit()
-        
-    finally:
-        conn.close()
\ No newline at end of file
+    
+    # BEGIN IMMEDIATE takes the write lock up front, so the whole batch runs in one
+    # transaction without a shared-to-write lock upgrade that could fail with SQLITE_BUSY
+    with transaction(config_path, "IMMEDIATE") as conn:
+        while batch_data:
+            placeholders = ", ".join(["(?, ?)"] * len(batch_data))
+            # Execute batch update (requires SQLite 3.33+ for UPDATE ... FROM)
+            conn.execute(
+                f"""
+                WITH scores(relevance_score, guid) AS (VALUES {placeholders})
+                UPDATE rss_entries
+                SET relevance_score = scores.relevance_score
+                FROM scores
+                WHERE rss_entries.guid = scores.guid
+                """,
+                [value for row in batch_data for value in row]
+            )
+            batch_data = list(itertools.islice(rows, UPDATE_BATCH_SIZE))
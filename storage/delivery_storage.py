@@ -2,52 +2,58 @@
 Database operations for deliveries.
 """
 
-import sqlite3
+from datetime import datetime
 from typing import Optional
 from models.delivery import Delivery
-from utils.config import get_database_file
+from utils.db import get_connection
 
 
 def save_delivery(delivery: Delivery, config_path: str) -> None:
     """Save a delivery record to the database."""
-    db_file = get_database_file(config_path)
-    conn = sqlite3.connect(db_file)
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
+    with get_connection(config_path) as conn:
+        conn.execute(
             """
             INSERT INTO deliveries (content, origin_message_id)
             VALUES (?, ?)
             """,
             (delivery.content, delivery.origin_message_id)
         )
-        conn.commit()
-    finally:
-        conn.close()
+
+
+# Kept as one constant so every call passes identical SQL text and reuses the
+# statement prepared in the connection's statement cache
+LATEST_DELIVERY_SQL = """
+    SELECT delivered_at, content, origin_message_id
+    FROM deliveries
+    ORDER BY delivered_at DESC
+    LIMIT 1
+"""
 
 
 def get_latest_delivery(config_path: str) -> Optional[Delivery]:
     """Get the latest delivery record from the database."""
-    db_file = get_database_file(config_path)
-    conn = sqlite3.connect(db_file)
-    conn.row_factory = sqlite3.Row
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT id, delivered_at, content, origin_message_id
-            FROM deliveries
-            ORDER BY delivered_at DESC
-            LIMIT 1
-            """
+    with get_connection(config_path) as conn:
+        row = conn.execute(LATEST_DELIVERY_SQL).fetchone()
+    if row:
+        delivered_at, content, origin_message_id = row
+        return Delivery(
+            delivered_at=delivered_at,
+            content=content,
+            origin_message_id=origin_message_id
         )
-        row = cursor.fetchone()
-        if row:
-            return Delivery(
-                delivered_at=row['delivered_at'],
-                content=row['content'],
-                origin_message_id=row['origin_message_id']
-            )
-        return None
-    finally:
-        conn.close()
+    return None
+
+
+# MAX over the indexed delivered_at column is answered from the index alone
+LATEST_DELIVERY_DATETIME_SQL = "SELECT MAX(delivered_at) FROM deliveries"
+
+
+def get_latest_delivery_datetime(config_path: str) -> Optional[datetime]:
+    """
+    Get the timestamp of the latest delivery without loading the delivery itself.
+    """
+    with get_connection(config_path) as conn:
+        row = conn.execute(LATEST_DELIVERY_DATETIME_SQL).fetchone()
+    if row and row[0]:
+        return datetime.fromisoformat(row[0])
+    return None
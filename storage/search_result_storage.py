@@ -2,10 +2,9 @@
 Database operations for search results.
 """
 
-import sqlite3
 from typing import List
 from models.search_result import SearchResult
-from utils.config import get_database_file
+from utils.db import transaction
 
 
 def save_search_results(search_results: List[SearchResult], config_path: str) -> None:
@@ -13,24 +12,21 @@ def save_search_results(search_results: List[SearchResult], config_path: str) ->
     if not search_results:
         return
         
-    db_file = get_database_file(config_path)
-    conn = sqlite3.connect(db_file)
-    try:
-        cursor = conn.cursor()
-        
-        # Prepare data for batch insertion
-        batch_data = []
-        for result in search_results:
-            batch_data.append((
-                result.title,
-                result.snippet,
-                result.source,
-                result.published_date,
-                str(result.link)
-            ))
-        
+    # Rows are generated while executemany binds them, without an intermediate list
+    batch_data = (
+        (
+            result.title,
+            result.snippet,
+            result.source,
+            result.published_date,
+            str(result.link)
+        )
+        for result in search_results
+    )
+    
+    with transaction(config_path) as conn:
         # Batch insert with conflict resolution (ignore duplicates based on title + source)
-        cursor.executemany(
+        conn.executemany(
             """
             INSERT OR IGNORE INTO search_results 
             (title, snippet, source, published_date, link)
@@ -38,7 +34,3 @@ def save_search_results(search_results: List[SearchResult], config_path: str) ->
             """,
             batch_data
         )
-        
-        conn.commit()
-    finally:
-        conn.close()
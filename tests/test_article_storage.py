@@ -0,0 +1,192 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+import pytest
+import yaml
+from utils.yaml_fast import SafeDumper
+from db.migrate import main as migrate
+from models.article import Article, ScoredArticle
+from storage import article_storage
+from storage.article_storage import save, get_articles_after, update_relevance_scores
+from utils.db import get_connection, transaction
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_article(index, **overrides):
+    """Build a minimal article published index minutes after BASE_TIME."""
+    fields = {
+        "guid": f"guid-{index:05d}",
+        "source": "Test Source",
+        "title": f"Article {index}",
+        "link": f"https://example.com/{index}",
+        "published_at": BASE_TIME + timedelta(minutes=index),
+    }
+    fields.update(overrides)
+    return Article(**fields)
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    """Database config pointing at a migrated database in tmp_path."""
+    config_file = tmp_path / "database.yaml"
+    config_file.write_text(yaml.dump({"database": {"file": str(tmp_path / "test.db")}}, Dumper=SafeDumper))
+    migrate(str(config_file))
+    return str(config_file)
+
+
+def fetch_rows(config_path, columns="guid, title"):
+    with get_connection(config_path) as conn:
+        return conn.execute(f"SELECT {columns} FROM rss_entries ORDER BY guid").fetchall()
+
+
+class TestSave:
+    """Tests for batched article writes."""
+
+    def test_save_across_batch_boundaries(self, config_path):
+        """Test that every article is stored when the input spans several batches."""
+        articles = [make_article(i) for i in range(1201)]
+
+        with patch.object(article_storage, "transaction", wraps=transaction) as mock_transaction:
+            save(articles, config_path)
+
+        # 500 + 500 + 201 rows
+        assert mock_transaction.call_count == 3
+        assert [guid for guid, _ in fetch_rows(config_path)] == [article.guid for article in articles]
+
+    def test_save_duplicate_guids_within_one_call(self, config_path):
+        """Test that the first article wins when a guid repeats within one call, across batches too."""
+        articles = [make_article(i) for i in range(10)]
+        duplicates = [make_article(3, title="Duplicate"), make_article(7, title="Duplicate")]
+
+        save(articles[:5] + duplicates + articles[5:], config_path, batch_size=4)
+
+        # The original guid-00003 precedes its duplicate, the original guid-00007 follows it
+        titles = dict(fetch_rows(config_path))
+        assert len(titles) == 10
+        assert titles["guid-00003"] == "Article 3"
+        assert titles["guid-00007"] == "Duplicate"
+
+    def test_save_duplicate_guids_across_calls(self, config_path):
+        """Test that saving an already stored guid keeps the stored row."""
+        save([make_article(1), make_article(2)], config_path)
+        save([make_article(2, title="Updated"), make_article(3)], config_path)
+
+        assert fetch_rows(config_path) == [
+            ("guid-00001", "Article 1"),
+            ("guid-00002", "Article 2"),
+            ("guid-00003", "Article 3"),
+        ]
+
+    def test_save_empty_input(self, config_path):
+        """Test that an empty input doesn't open a transaction."""
+        with patch.object(article_storage, "transaction") as mock_transaction:
+            save([], config_path)
+
+        mock_transaction.assert_not_called()
+
+    def test_save_round_trip_through_get_articles_after(self, config_path):
+        """Test that saved articles are read back newest first, filtered by published_at."""
+        articles = [make_article(i) for i in range(1201)]
+        save(articles, config_path)
+
+        result = get_articles_after(config_path, BASE_TIME + timedelta(minutes=199))
+
+        assert [article.guid for article in result] == [article.guid for article in reversed(articles[200:])]
+        assert [article.published_at for article in result] == [article.published_at for article in reversed(articles[200:])]
+
+
+class TestUpdateRelevanceScores:
+    """Tests for batched relevance score updates."""
+
+    def test_update_across_batch_boundaries(self, config_path):
+        """Test that scores are written for more than one batch and other rows stay untouched."""
+        articles = [make_article(i) for i in range(1300)]
+        save(articles, config_path)
+        scored = [
+            ScoredArticle(**article.model_dump(exclude={"relevance_score"}), relevance_score=i % 100 + 1, reasoning=f"Reason {i}")
+            for i, article in enumerate(articles[:1201])
+        ]
+
+        update_relevance_scores(scored, config_path)
+
+        scores = dict(fetch_rows(config_path, "guid, relevance_score"))
+        assert [scores[article.guid] for article in scored] == [article.relevance_score for article in scored]
+        assert all(scores[article.guid] is None for article in articles[1201:])
+
+    def test_update_skips_articles_without_score(self, config_path):
+        """Test that an article without a score keeps its stored score."""
+        save([make_article(1), make_article(2)], config_path)
+        update_relevance_scores([make_article(1, relevance_score=40), make_article(2, relevance_score=60)], config_path)
+
+        update_relevance_scores([make_article(1, relevance_score=None), make_article(2, relevance_score=80)], config_path)
+
+        assert fetch_rows(config_path, "guid, relevance_score") == [("guid-00001", 40), ("guid-00002", 80)]
+
+    def test_update_read_back_through_get_articles_after(self, config_path):
+        """Test that updated scores are returned by get_articles_after."""
+        articles = [make_article(i) for i in range(600)]
+        save(articles, config_path)
+        update_relevance_scores([make_article(i, relevance_score=i % 100) for i in range(0, 600, 2)], config_path)
+
+        result = get_articles_after(config_path, BASE_TIME - timedelta(minutes=1))
+
+        assert {article.guid: article.relevance_score for article in result} == {
+            article.guid: (i % 100 if i % 2 == 0 else None) for i, article in enumerate(articles)
+        }
+
+    def test_update_empty_input(self, config_path):
+        """Test that an input without scores doesn't open a transaction."""
+        with patch.object(article_storage, "transaction") as mock_transaction:
+            update_relevance_scores([make_article(1)], config_path)
+
+        mock_transaction.assert_not_called()
+
+
+class TestGetArticlesAfter:
+    """Tests for reading articles back from the database."""
+
+    def test_round_trip_preserves_every_field(self, config_path):
+        """Test that fully populated and sparse articles are read back field by field."""
+        full = make_article(
+            1,
+            summary="Summary, with a comma",
+            author="Jane Doe",
+            categories=["AI", "Agents", "LLM"],
+        )
+        sparse = make_article(2, summary=None, author=None, categories=[])
+        scored = make_article(3, categories=["AI"])
+        unpublished = make_article(4, published_at=None)
+        save([full, sparse, scored, unpublished], config_path)
+        update_relevance_scores([make_article(3, relevance_score=87)], config_path)
+        expected = [scored.model_copy(update={"relevance_score": 87}), sparse, full]
+
+        result = get_articles_after(config_path, BASE_TIME)
+
+        # Rows without published_at never match the published_at filter
+        assert [article.guid for article in result] == [article.guid for article in expected]
+        for article, original in zip(result, expected):
+            assert article.guid == original.guid
+            assert article.source == original.source
+            assert article.title == original.title
+            assert str(article.link) == str(original.link)
+            assert article.summary == original.summary
+            assert article.author == original.author
+            assert article.categories == original.categories
+            assert article.published_at == original.published_at
+            assert article.posted is False
+            assert article.relevance_score == original.relevance_score
+            assert isinstance(article.fetched_at, datetime)
+
+    def test_parses_utc_designator(self, config_path):
+        """Test that timestamps stored with a trailing 'Z' are parsed as UTC."""
+        with transaction(config_path) as conn:
+            conn.execute(
+                "INSERT INTO rss_entries (guid, source, title, link, published_at) VALUES (?, ?, ?, ?, ?)",
+                ("guid-z", "Test Source", "Zulu", "https://example.com/z", "2024-01-01T00:30:00Z"),
+            )
+
+        result = get_articles_after(config_path, BASE_TIME)
+
+        assert len(result) == 1
+        assert result[0].published_at == BASE_TIME + timedelta(minutes=30)
+        assert result[0].relevance_score is None
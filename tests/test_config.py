@@ -1,21 +1,39 @@
 import pytest
 import yaml
+from utils.yaml_fast import SafeDumper
 from pathlib import Path
-from utils.config import load_config, get_database_file, get_sources_config
+from utils.config import load_config, get_database_file, get_sources_config, is_database_wal_enabled
+
+DB_CONFIG_DATA = {"database": {"file": "my_database.db"}}
+
+
+@pytest.fixture(scope="session")
+def db_config_file(tmp_path_factory):
+    """Valid database config written once per session; tests must only read it."""
+    config_file = tmp_path_factory.mktemp("cfg") / "db_config.yaml"
+    config_file.write_text(yaml.dump(DB_CONFIG_DATA, Dumper=SafeDumper))
+    return str(config_file)
 
 
 class TestConfig:
     """Essential tests for config functions."""
 
-    def test_load_config_valid_file(self, tmp_path):
+    def test_load_config_valid_file(self, db_config_file):
         """Test loading a valid YAML configuration file."""
-        config_data = {"database": {"file": "test.db"}}
-        
+        result = load_config(db_config_file)
+        assert result == DB_CONFIG_DATA
+
+    def test_load_config_cached_until_file_changes(self, tmp_path):
+        """Test that a config is parsed once and reloaded after the file changes."""
         config_file = tmp_path / "config.yaml"
-        config_file.write_text(yaml.dump(config_data))
+        config_file.write_text(yaml.dump({"database": {"file": "test.db"}}, Dumper=SafeDumper))
         
-        result = load_config(str(config_file))
-        assert result == config_data
+        first = load_config(str(config_file))
+        assert load_config(str(config_file)) is first
+        
+        config_file.write_text(yaml.dump({"database": {"file": "other_test.db"}}, Dumper=SafeDumper))
+        
+        assert load_config(str(config_file)) == {"database": {"file": "other_test.db"}}
 
     def test_load_config_file_not_found(self, tmp_path):
         """Test that FileNotFoundError is raised when config file doesn't exist."""
@@ -24,14 +42,9 @@ class TestConfig:
         with pytest.raises(FileNotFoundError):
             load_config(str(non_existent_file))
 
-    def test_get_database_file_valid(self, tmp_path):
+    def test_get_database_file_valid(self, db_config_file):
         """Test getting database file from valid configuration."""
-        config_data = {"database": {"file": "my_database.db"}}
-        
-        config_file = tmp_path / "db_config.yaml"
-        config_file.write_text(yaml.dump(config_data))
-        
-        result = get_database_file(str(config_file))
+        result = get_database_file(db_config_file)
         assert result == "my_database.db"
 
     def test_get_database_file_missing_key(self, tmp_path):
@@ -39,11 +52,20 @@ class TestConfig:
         config_data = {"other": "value"}
         
         config_file = tmp_path / "missing_db_config.yaml"
-        config_file.write_text(yaml.dump(config_data))
+        config_file.write_text(yaml.dump(config_data, Dumper=SafeDumper))
         
         with pytest.raises(ValueError):
             get_database_file(str(config_file))
 
+    def test_is_database_wal_enabled_defaults_to_true(self, tmp_path):
+        """Test that WAL mode is enabled unless the config turns it off."""
+        config_file = tmp_path / "db_config.yaml"
+        config_file.write_text(yaml.dump({"database": {"file": "my_database.db"}}, Dumper=SafeDumper))
+        assert is_database_wal_enabled(str(config_file)) is True
+        
+        config_file.write_text(yaml.dump({"database": {"file": "my_database.db", "wal": False}}, Dumper=SafeDumper))
+        assert is_database_wal_enabled(str(config_file)) is False
+
     def test_get_sources_config_valid(self, tmp_path):
         """Test getting sources configuration with valid data."""
         config_data = {
@@ -53,7 +75,7 @@ class TestConfig:
         }
         
         config_file = tmp_path / "sources_config.yaml"
-        config_file.write_text(yaml.dump(config_data))
+        config_file.write_text(yaml.dump(config_data, Dumper=SafeDumper))
         
         result = get_sources_config(str(config_file))
         assert result == config_data
@@ -67,7 +89,7 @@ class TestConfig:
         }
         
         config_file = tmp_path / "no_enabled_sources.yaml"
-        config_file.write_text(yaml.dump(config_data))
+        config_file.write_text(yaml.dump(config_data, Dumper=SafeDumper))
         
         with pytest.raises(ValueError):
             get_sources_config(str(config_file))
@@ -0,0 +1,72 @@
+import sqlite3
+import pytest
+import yaml
+from utils.yaml_fast import SafeDumper
+from unittest.mock import MagicMock
+from utils.db import configure_connection, get_connection, transaction
+
+
+class TestTransaction:
+    """Tests for transactions on the shared connection."""
+
+    @pytest.fixture
+    def config_path(self, tmp_path):
+        """Database config pointing at a fresh database file."""
+        config_file = tmp_path / "database.yaml"
+        config_file.write_text(yaml.dump({"database": {"file": str(tmp_path / "test.db")}}, Dumper=SafeDumper))
+        return str(config_file)
+
+    def test_failed_commit_is_rolled_back(self, config_path):
+        """Test that a COMMIT that fails leaves the shared connection usable for the next transaction."""
+        with get_connection(config_path) as conn:
+            # A deferred foreign key is only checked at COMMIT, which then fails
+            # with the transaction still open
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("CREATE TABLE parents (id INTEGER PRIMARY KEY)")
+            conn.execute("""
+                CREATE TABLE children (
+                    id INTEGER PRIMARY KEY,
+                    parent_id INTEGER REFERENCES parents (id) DEFERRABLE INITIALLY DEFERRED
+                )
+            """)
+        
+        with pytest.raises(sqlite3.IntegrityError):
+            with transaction(config_path) as conn:
+                conn.execute("INSERT INTO children (parent_id) VALUES (1)")
+        
+        with get_connection(config_path) as conn:
+            assert not conn.in_transaction
+        
+        with transaction(config_path) as conn:
+            conn.execute("INSERT INTO parents (id) VALUES (1)")
+            conn.execute("INSERT INTO children (parent_id) VALUES (1)")
+        
+        with get_connection(config_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM children").fetchone()[0] == 1
+
+    def test_error_in_block_rolls_back(self, config_path):
+        """Test that an exception inside the block discards the transaction's writes."""
+        with get_connection(config_path) as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        
+        with pytest.raises(RuntimeError):
+            with transaction(config_path) as conn:
+                conn.execute("INSERT INTO items (id) VALUES (1)")
+                raise RuntimeError("boom")
+        
+        with get_connection(config_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+
+class TestConfigureConnection:
+    """Tests for the shared connection settings."""
+
+    def test_busy_timeout_set_before_journal_mode(self):
+        """Test that busy_timeout applies before the WAL switch, which has to wait for locks."""
+        conn = MagicMock()
+        conn.execute.return_value.fetchone.return_value = ("wal",)
+        
+        configure_connection(conn)
+        
+        pragmas = [call.args[0] for call in conn.execute.call_args_list]
+        assert pragmas.index("PRAGMA busy_timeout=30000") < pragmas.index("PRAGMA journal_mode=WAL")
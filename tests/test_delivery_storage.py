@@ -0,0 +1,29 @@
+import sqlite3
+import pytest
+from db.migrate import get_applied_migrations, apply_migrations, read_pending_migrations
+from storage.delivery_storage import LATEST_DELIVERY_SQL, LATEST_DELIVERY_DATETIME_SQL
+
+
+class TestDeliveryStorage:
+    """Tests for delivery storage queries."""
+
+    @pytest.fixture
+    def conn(self):
+        """In-memory database with every migration applied."""
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        apply_migrations(conn, read_pending_migrations(get_applied_migrations(conn)))
+        yield conn
+        conn.close()
+
+    @pytest.mark.parametrize("query", [LATEST_DELIVERY_SQL, LATEST_DELIVERY_DATETIME_SQL], ids=["latest_delivery", "latest_delivery_datetime"])
+    def test_latest_delivery_queries_use_index(self, conn, query):
+        """
+        Test that the latest-delivery queries are answered from the delivered_at index.
+        
+        Without it SQLite has to sort the whole table to return a single row.
+        """
+        plan = " ".join(row['detail'] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}"))
+        
+        assert "idx_delivered_at_deliveries" in plan, plan
+        assert "TEMP B-TREE" not in plan, f"Query should not sort in a temporary b-tree: {plan}"
@@ -7,22 +7,30 @@ from models.article import ScoredArticle
 class TestFilterTopArticles:
     """Tests for filter_top_articles function."""
 
+    # Fields shared by every test article, validated once
+    _TEMPLATE = ScoredArticle(
+        guid="test-guid",
+        source="Test Source",
+        title="",
+        link="https://example.com/article",
+        summary="Test summary",
+        author="Test Author",
+        categories=["AI"],
+        published_at=datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+        fetched_at=datetime(2024, 1, 1, 13, 0, 0, tzinfo=timezone.utc),
+        posted=False,
+        relevance_score=None,
+        reasoning="Test reasoning"
+    )
+
     def create_scored_article(self, title, score, reasoning="Test reasoning"):
-        """Create a test scored article."""
-        return ScoredArticle(
-            guid=f"test-guid-{title.lower().replace(' ', '-')}",
-            source="Test Source",
-            title=title,
-            link="https://example.com/article",
-            summary="Test summary",
-            author="Test Author",
-            categories=["AI"],
-            published_at=datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
-            fetched_at=datetime(2024, 1, 1, 13, 0, 0, tzinfo=timezone.utc),
-            posted=False,
-            relevance_score=score,
-            reasoning=reasoning
-        )
+        """Create a test scored article from the shared template."""
+        return self._TEMPLATE.model_copy(update={
+            "guid": f"test-guid-{title.lower().replace(' ', '-')}",
+            "title": title,
+            "relevance_score": score,
+            "reasoning": reasoning
+        })
 
     def test_filter_top_articles_empty_list(self):
         """Test filtering empty article list."""
@@ -0,0 +1,160 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, AsyncMock
+import main
+from main import DigestState, _create_digest_workflow
+
+
+def article_batches(*batches, error=None):
+    """Build a load_article_batches replacement yielding the given batches, then raising error."""
+    async def load_article_batches(config_path):
+        for batch in batches:
+            yield batch
+        if error:
+            raise error
+    return load_article_batches
+
+
+class TestDigestWorkflow:
+    """Tests for the digest workflow: fetch and summary branches fanning in at deliver."""
+
+    @pytest.fixture
+    def deliver_deps(self):
+        """Patch everything the deliver node calls past its error/summary guard."""
+        with patch("main._get_fresh_articles") as mock_fresh, \
+             patch("processing.scoring.assign_relevance_score") as mock_score, \
+             patch("main.update_relevance_scores") as mock_update, \
+             patch("processing.filtering.filter_top_articles") as mock_filter, \
+             patch("processing.post_creator.PostCreator") as mock_post_creator, \
+             patch("delivery.telegram.send_async", new_callable=AsyncMock) as mock_send, \
+             patch("main.save_delivery") as mock_save_delivery:
+            mock_post_creator.return_value.create_post.return_value = "Digest post"
+            mock_send.return_value = 42
+            yield SimpleNamespace(
+                fresh=mock_fresh,
+                score=mock_score,
+                update=mock_update,
+                filter=mock_filter,
+                send=mock_send,
+                save_delivery=mock_save_delivery,
+            )
+
+    def run_workflow(self):
+        return asyncio.run(_create_digest_workflow().ainvoke(DigestState()))
+
+    @patch("main._make_summary", new_callable=AsyncMock)
+    @patch("main.article_storage.save")
+    def test_happy_path_delivers_once_with_summary(self, mock_save, mock_make_summary, deliver_deps):
+        """Test that deliver runs once, after both branches, with the summary made in parallel."""
+        mock_make_summary.return_value = "Summary text"
+
+        with patch("main.load_article_batches", article_batches(["a1", "a2"], ["a3"])):
+            result = self.run_workflow()
+
+        assert not result.get("error")
+        assert result["summary_text"] == "Summary text"
+        assert mock_save.call_count == 2
+        deliver_deps.score.assert_called_once_with(deliver_deps.fresh.return_value, "Summary text")
+        deliver_deps.send.assert_awaited_once_with("Digest post")
+        deliver_deps.save_delivery.assert_called_once()
+
+    @patch("main._make_summary", new_callable=AsyncMock)
+    @patch("main.article_storage.save")
+    def test_fetch_error_skips_delivery(self, mock_save, mock_make_summary, deliver_deps):
+        """Test that a fetch error is kept in the result and nothing is delivered."""
+        mock_make_summary.return_value = "Summary text"
+
+        with patch("main.load_article_batches", article_batches(error=RuntimeError("feed down"))):
+            result = self.run_workflow()
+
+        assert result["error"] == "Failed to fetch and store articles: feed down"
+        mock_make_summary.assert_awaited_once()
+        deliver_deps.fresh.assert_not_called()
+        deliver_deps.send.assert_not_awaited()
+
+    @patch("main._make_summary", new_callable=AsyncMock)
+    @patch("main.article_storage.save")
+    def test_missing_summary_skips_delivery(self, mock_save, mock_make_summary, deliver_deps):
+        """Test that nothing is delivered when no summary was made."""
+        mock_make_summary.return_value = None
+
+        with patch("main.load_article_batches", article_batches(["a1"])):
+            result = self.run_workflow()
+
+        assert not result.get("error")
+        deliver_deps.fresh.assert_not_called()
+        deliver_deps.send.assert_not_awaited()
+
+    @patch("main.make_summary_node", new_callable=AsyncMock)
+    @patch("main.fetch_articles_node", new_callable=AsyncMock)
+    def test_both_branches_fail_first_error_wins(self, mock_fetch_node, mock_summary_node, deliver_deps):
+        """Test that errors from both parallel branches merge into the first one."""
+        mock_fetch_node.return_value = {"error": "fetch failed"}
+        mock_summary_node.return_value = {"error": "summary failed", "summary_text": None}
+
+        result = self.run_workflow()
+
+        assert result["error"] == "fetch failed"
+        mock_fetch_node.assert_awaited_once()
+        mock_summary_node.assert_awaited_once()
+        deliver_deps.send.assert_not_awaited()
+
+    def test_keep_first_error_reducer(self):
+        """Test the error reducer on its own."""
+        assert main._keep_first_error(None, "second") == "second"
+        assert main._keep_first_error("first", "second") == "first"
+        assert main._keep_first_error("first", None) == "first"
+
+
+class TestMain:
+    """Tests for the main entry point."""
+
+    @patch("main.fetch_articles_node", new_callable=AsyncMock)
+    @patch("main._get_digest_workflow")
+    @patch("main._is_delivery_due", return_value=False)
+    def test_outside_delivery_window_only_fetches(self, mock_due, mock_get_workflow, mock_fetch_node):
+        """Test that only articles are fetched when delivery isn't due."""
+        mock_fetch_node.return_value = {}
+
+        main.main()
+
+        mock_get_workflow.assert_not_called()
+        mock_fetch_node.assert_awaited_once()
+
+    @patch("main.fetch_articles_node", new_callable=AsyncMock)
+    @patch("main._get_digest_workflow")
+    @patch("main._is_delivery_due", return_value=False)
+    def test_outside_delivery_window_fetch_error_raises(self, mock_due, mock_get_workflow, mock_fetch_node):
+        """Test that a fetch error outside the delivery window fails the run."""
+        mock_fetch_node.return_value = {"error": "Failed to fetch and store articles: feed down"}
+
+        with pytest.raises(Exception, match="feed down"):
+            main.main()
+
+        mock_get_workflow.assert_not_called()
+
+    @patch("main.fetch_articles_node", new_callable=AsyncMock)
+    @patch("main._get_digest_workflow")
+    @patch("main._is_delivery_due", return_value=True)
+    def test_delivery_due_runs_workflow(self, mock_due, mock_get_workflow, mock_fetch_node):
+        """Test that the whole workflow runs when delivery is due."""
+        workflow = MagicMock()
+        workflow.ainvoke = AsyncMock(return_value={"summary_text": "Summary text"})
+        mock_get_workflow.return_value = workflow
+
+        main.main()
+
+        workflow.ainvoke.assert_awaited_once_with(DigestState())
+        mock_fetch_node.assert_not_awaited()
+
+    @patch("main._get_digest_workflow")
+    @patch("main._is_delivery_due", return_value=True)
+    def test_delivery_due_workflow_error_raises(self, mock_due, mock_get_workflow):
+        """Test that an error left in the workflow result fails the run."""
+        workflow = MagicMock()
+        workflow.ainvoke = AsyncMock(return_value={"error": "Failed to process and deliver digest: boom"})
+        mock_get_workflow.return_value = workflow
+
+        with pytest.raises(Exception, match="boom"):
+            main.main()
@@ -1,12 +1,40 @@
 import sqlite3
+import pytest
+import yaml
 from unittest.mock import patch, mock_open
-from db.migrate import get_applied_migrations, apply_migration, main
+from utils.yaml_fast import SafeDumper
+from db.migrate import get_applied_migrations, apply_migrations, main
 
 
 class TestMigrate:
     """Tests for the migration system."""
 
-    def test_get_applied_migrations_creates_table(self):
+    @pytest.fixture
+    def conn(self):
+        """
+        Fresh in-memory database connection, closed after the test.
+        
+        In-memory databases avoid file system issues and are faster than real files.
+        The row factory lets tests access columns by name: row['filename'] instead of row[0].
+        """
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        yield conn
+        # Always close the database connection to prevent resource leaks
+        conn.close()
+
+    @pytest.fixture
+    def conn_with_migrations_table(self, conn):
+        """In-memory connection whose database already has the schema_migrations table."""
+        conn.executescript("""
+            CREATE TABLE schema_migrations (
+                filename TEXT PRIMARY KEY,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+        return conn
+
+    def test_get_applied_migrations_creates_table(self, conn):
         """
         Test that get_applied_migrations creates the schema_migrations table and returns empty set.
         
@@ -15,91 +43,111 @@ class TestMigrate:
         2. It should return an empty set when no migrations have been applied yet
         3. The table should have the correct structure (filename and applied_at columns)
         """
-        # Create an in-memory database for testing
-        # This avoids file system issues and is faster than real files
-        conn = sqlite3.connect(":memory:")
+        # Call the function under test
+        # This should create the schema_migrations table if it doesn't exist
+        applied_migrations = get_applied_migrations(conn)
         
-        # Enable row factory so we can access columns by name instead of index
-        # This makes the code more readable: row['filename'] instead of row[0]
-        conn.row_factory = sqlite3.Row
+        # Since this is a fresh database, no migrations should be applied yet
+        # The function should return an empty set
+        assert applied_migrations == set()
         
-        try:
-            # Call the function under test
-            # This should create the schema_migrations table if it doesn't exist
-            applied_migrations = get_applied_migrations(conn)
-            
-            # Since this is a fresh database, no migrations should be applied yet
-            # The function should return an empty set
-            assert applied_migrations == set()
-            
-            # Verify that the schema_migrations table was actually created
-            # PRAGMA table_info returns metadata about table columns
-            cursor = conn.execute("PRAGMA table_info(schema_migrations)")
-            table_columns = cursor.fetchall()
-            
-            # Extract just the column names for easier checking
-            column_names = [row['name'] for row in table_columns]
-            
-            # The table should have both required columns
-            assert 'filename' in column_names, "schema_migrations table should have 'filename' column"
-            assert 'applied_at' in column_names, "schema_migrations table should have 'applied_at' column"
-            
-        finally:
-            # Always close the database connection to prevent resource leaks
-            conn.close()
+        # Verify that the schema_migrations table was actually created
+        # PRAGMA table_info returns metadata about table columns
+        cursor = conn.execute("PRAGMA table_info(schema_migrations)")
+        table_columns = cursor.fetchall()
+        
+        # Extract just the column names for easier checking
+        column_names = [row['name'] for row in table_columns]
+        
+        # The table should have both required columns
+        assert 'filename' in column_names, "schema_migrations table should have 'filename' column"
+        assert 'applied_at' in column_names, "schema_migrations table should have 'applied_at' column"
+
+    def test_get_applied_migrations_returns_recorded_filenames(self, conn_with_migrations_table):
+        """Test that get_applied_migrations returns every filename recorded in schema_migrations."""
+        conn = conn_with_migrations_table
+        filenames = {"001_init.sql", "002_create_search_summaries.sql", "003_create_deliveries.sql"}
+        conn.executemany("INSERT INTO schema_migrations (filename) VALUES (?)", [(filename,) for filename in filenames])
+        
+        assert get_applied_migrations(conn) == filenames
 
-    def test_apply_migration_executes_sql_and_records(self):
+    def test_apply_migrations_executes_sql_and_records(self, conn_with_migrations_table):
         """
-        Test that apply_migration executes SQL and records the migration in schema_migrations.
+        Test that apply_migrations executes SQL and records the migration in schema_migrations.
         
         This test verifies the core migration application functionality:
         1. It should execute the provided SQL statements
         2. It should record the migration filename in schema_migrations table
-        3. It should commit the changes to the database
-        4. The executed SQL should actually create/modify database objects
+        3. The executed SQL should actually create/modify database objects
         """
-        # Create an in-memory database for testing
-        conn = sqlite3.connect(":memory:")
-        conn.row_factory = sqlite3.Row
+        # The fixture simulates a database that already has the migration tracking table
+        conn = conn_with_migrations_table
+        
+        # Define test SQL that will create a new table
+        # This is what would be in a real migration file
+        test_sql = "CREATE TABLE test_users (id INTEGER PRIMARY KEY, name TEXT);"
+        migration_filename = "001_create_users.sql"
+        
+        # Call the function under test
+        # This should execute the SQL and record the migration
+        apply_migrations(conn, [(migration_filename, test_sql)])
+        
+        # Verify that the SQL was actually executed
+        # Check if the table was created by querying sqlite_master
+        cursor = conn.execute("""
+            SELECT name FROM sqlite_master 
+            WHERE type='table' AND name='test_users'
+        """)
+        table_exists = cursor.fetchone() is not None
+        assert table_exists, "The test_users table should have been created by the migration"
+        
+        # Verify that the migration was recorded in schema_migrations table
+        cursor = conn.execute("SELECT filename FROM schema_migrations")
+        recorded_migrations = [row['filename'] for row in cursor.fetchall()]
+        assert migration_filename in recorded_migrations, f"Migration {migration_filename} should be recorded in schema_migrations"
+        
+        # Verify that only our migration is recorded (no duplicates)
+        assert len(recorded_migrations) == 1, "Should have exactly one recorded migration"
+        assert recorded_migrations[0] == migration_filename, "Recorded migration should match the applied one"
+
+    def test_apply_migrations_records_all_in_order(self, conn_with_migrations_table):
+        """Test that several migrations run in order and are all recorded."""
+        conn = conn_with_migrations_table
+        pending = [
+            ("001_create_users.sql", "CREATE TABLE test_users (id INTEGER PRIMARY KEY);"),
+            ("002_add_name.sql", "ALTER TABLE test_users ADD COLUMN name TEXT; CREATE INDEX idx_name ON test_users (name);"),
+        ]
         
+        apply_migrations(conn, pending)
+        
+        column_names = [row['name'] for row in conn.execute("PRAGMA table_info(test_users)")]
+        assert column_names == ['id', 'name']
+        assert get_applied_migrations(conn) == {"001_create_users.sql", "002_add_name.sql"}
+
+    def test_main_rolls_back_all_migrations_on_error(self, tmp_path):
+        """
+        Test that a failing migration leaves neither its changes nor any schema_migrations row behind.
+        All pending migrations run in one transaction, so an earlier successful one is rolled back too.
+        """
+        migrations_dir = tmp_path / "migrations"
+        migrations_dir.mkdir()
+        (migrations_dir / "001_create_users.sql").write_text("CREATE TABLE test_users (id INTEGER PRIMARY KEY);")
+        # The first statement succeeds, the second one fails on a missing table
+        (migrations_dir / "002_broken.sql").write_text(
+            "CREATE TABLE test_posts (id INTEGER PRIMARY KEY); INSERT INTO missing_table VALUES (1);"
+        )
+        db_file = tmp_path / "test.db"
+        config_file = tmp_path / "database.yaml"
+        config_file.write_text(yaml.dump({"database": {"file": str(db_file)}}, Dumper=SafeDumper))
+        
+        with patch("db.migrate.MIGRATIONS_DIR", str(migrations_dir)):
+            with pytest.raises(sqlite3.OperationalError):
+                main(str(config_file))
+        
+        # Nothing created inside the transaction survives, not even schema_migrations
+        conn = sqlite3.connect(db_file)
         try:
-            # First, create the schema_migrations table manually
-            # This simulates a database that already has the migration tracking table
-            conn.execute("""
-                CREATE TABLE schema_migrations (
-                    filename TEXT PRIMARY KEY,
-                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            conn.commit()
-            
-            # Define test SQL that will create a new table
-            # This is what would be in a real migration file
-            test_sql = "CREATE TABLE test_users (id INTEGER PRIMARY KEY, name TEXT);"
-            migration_filename = "001_create_users.sql"
-            
-            # Call the function under test
-            # This should execute the SQL and record the migration
-            apply_migration(conn, migration_filename, test_sql)
-            
-            # Verify that the SQL was actually executed
-            # Check if the table was created by querying sqlite_master
-            cursor = conn.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name='test_users'
-            """)
-            table_exists = cursor.fetchone() is not None
-            assert table_exists, "The test_users table should have been created by the migration"
-            
-            # Verify that the migration was recorded in schema_migrations table
-            cursor = conn.execute("SELECT filename FROM schema_migrations")
-            recorded_migrations = [row['filename'] for row in cursor.fetchall()]
-            assert migration_filename in recorded_migrations, f"Migration {migration_filename} should be recorded in schema_migrations"
-            
-            # Verify that only our migration is recorded (no duplicates)
-            assert len(recorded_migrations) == 1, "Should have exactly one recorded migration"
-            assert recorded_migrations[0] == migration_filename, "Recorded migration should match the applied one"
-            
+            tables = [name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
         finally:
-            # Always close the database connection to prevent resource leaks
-            conn.close()
\ No newline at end of file
+            conn.close()
+        assert tables == []
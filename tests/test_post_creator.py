@@ -1,220 +1,243 @@
 """Tests for the post creator module."""
 
 from datetime import datetime
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
 
 from processing.post_creator import PostCreator
 from models.article import ScoredArticle
 
 
+# Config shared by all tests; PostCreator only reads it
+BASE_CONFIG = {
+    "post_creator": {
+        "chat_model": {"model": "gpt-4.1", "model_provider": "openai", "temperature": 0.7},
+        "max_articles_in_post": 5,
+        "post_prompt": "Test prompt",
+        "system_message": "Test system message"
+    }
+}
+
+# Fixed "current" time, so test articles are deterministic
+FROZEN_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+# Articles are immutable, so each payload is validated once per module and shared between tests
+
+@pytest.fixture(scope="module")
+def two_articles():
+    """Two articles with fixed publication dates, for prompt formatting."""
+    return (
+        ScoredArticle(
+            guid="test-guid-1",
+            title="Test Article 1",
+            summary="This is a test summary for article 1",
+            source="Test Source 1",
+            link="https://example.com/1",
+            published_at=datetime(2024, 1, 1),
+            reasoning="Highly relevant to AI agents due to direct framework discussion"
+        ),
+        ScoredArticle(
+            guid="test-guid-2",
+            title="Test Article 2",
+            summary="This is a test summary for article 2",
+            source="Test Source 2",
+            link="https://example.com/2",
+            published_at=datetime(2024, 1, 2),
+            reasoning="Moderately relevant with some AI agent applications"
+        )
+    )
+
+
+@pytest.fixture(scope="module")
+def one_article():
+    """A single article to build a post from."""
+    return (
+        ScoredArticle(guid="test-guid", title="Test Article", summary="Test summary", 
+                    source="Test Source", link="https://example.com", published_at=FROZEN_NOW,
+                    reasoning="Excellent AI agent content"),
+    )
+
+
+@pytest.fixture(scope="module")
+def two_fallback_articles():
+    """Two articles for the fallback post."""
+    return (
+        ScoredArticle(guid="test-guid-1", title="Test Article 1", summary="Test summary 1", 
+                    source="Test Source 1", link="https://example.com/1", published_at=FROZEN_NOW,
+                    reasoning="High relevance for AI agents"),
+        ScoredArticle(guid="test-guid-2", title="Test Article 2", summary="Test summary 2", 
+                    source="Test Source 2", link="https://example.com/2", published_at=FROZEN_NOW,
+                    reasoning="Good AI agent applications")
+    )
+
+
+@pytest.fixture(scope="module")
+def long_reasoning_article():
+    """An article whose reasoning is long enough to be truncated in the fallback post."""
+    return (
+        ScoredArticle(
+            guid="test-guid-1", 
+            title="AI Agent Framework Released", 
+            summary="New framework for building AI agents", 
+            source="TechCrunch", 
+            link="https://techcrunch.com/ai-agent-framework", 
+            published_at=FROZEN_NOW,
+            reasoning="This is a groundbreaking development in AI agent technology that will enable developers to build more sophisticated autonomous systems"
+        ),
+    )
+
+
+@pytest.fixture(scope="module")
+def one_article_special_chars():
+    """An article with characters that must be escaped in HTML."""
+    return (
+        ScoredArticle(
+            guid="test-guid-1", 
+            title="AI & ML: The Future of Technology!", 
+            summary="Test summary with special chars: *bold* _italic_ [link](url)", 
+            source="TechCrunch & Wired", 
+            link="https://example.com/test?param=value&other=tag", 
+            published_at=FROZEN_NOW,
+            reasoning="This article discusses *bold* AI developments & future technologies"
+        ),
+    )
+
+
+class FakeChat:
+    """Minimal chat model stub: invoke returns a fixed response or raises, and counts its calls."""
+    
+    def __init__(self, ret=None, exc=None):
+        self.calls = 0
+        self._ret = ret
+        self._exc = exc
+    
+    def invoke(self, *args, **kwargs):
+        self.calls += 1
+        if self._exc:
+            raise self._exc
+        return self._ret
+
+
 class TestPostCreator:
     """Test cases for PostCreator class."""
     
-    def test_format_articles_for_post(self):
-        """Test article formatting for post prompt."""
-        with patch('processing.post_creator.load_config') as mock_load_config:
-            mock_config = {
-                "post_creator": {
-                    "max_articles_in_post": 3,
-                    "chat_model": {"model": "gpt-4.1", "model_provider": "openai", "temperature": 0.7}
-                }
-            }
-            mock_load_config.return_value = mock_config
+    @pytest.fixture
+    def make_creator(self):
+        """
+        Factory building a PostCreator from an in-memory config with a stub chat model.
+        The chat model's invoke returns invoke_return, or raises invoke_exc when given.
+        Returns the creator and the stub chat model.
+        """
+        def _make_creator(invoke_return=None, invoke_exc=None, config_overrides=None):
+            # The base config is shared; overrides get their own shallow copy
+            mock_config = BASE_CONFIG
+            if config_overrides:
+                mock_config = {**BASE_CONFIG, "post_creator": {**BASE_CONFIG["post_creator"], **config_overrides}}
+            chat_model = FakeChat(ret=invoke_return, exc=invoke_exc)
             
-            with patch('processing.post_creator.init_chat_model'):
-                creator = PostCreator("test_config.yaml")
-                
-                articles = [
-                    ScoredArticle(
-                        guid="test-guid-1",
-                        title="Test Article 1",
-                        summary="This is a test summary for article 1",
-                        source="Test Source 1",
-                        link="https://example.com/1",
-                        published_at=datetime(2024, 1, 1),
-                        reasoning="Highly relevant to AI agents due to direct framework discussion"
-                    ),
-                    ScoredArticle(
-                        guid="test-guid-2",
-                        title="Test Article 2",
-                        summary="This is a test summary for article 2",
-                        source="Test Source 2",
-                        link="https://example.com/2",
-                        published_at=datetime(2024, 1, 2),
-                        reasoning="Moderately relevant with some AI agent applications"
-                    )
-                ]
-                
-                formatted = creator._format_articles_for_post(articles)
-                
-                assert "1. Test Article 1" in formatted
-                assert "This is a test summary for article 1" in formatted
-                assert "Source: Test Source 1" in formatted
-                assert "Published: 2024-01-01 00:00" in formatted
-                assert "Link: https://example.com/1" in formatted
-                assert "🎯 WHY THIS MATTERS: Highly relevant to AI agents due to direct framework discussion" in formatted
-                assert "2. Test Article 2" in formatted
+            # The chat model is only created while the creator is initialized
+            with patch('processing.post_creator.init_chat_model', return_value=chat_model):
+                creator = PostCreator(config=mock_config)
+            return creator, chat_model
+        return _make_creator
     
-    def test_create_post_success(self):
+    def test_init_requires_config(self):
+        """Test that a config path or a config dict is required."""
+        with pytest.raises(ValueError):
+            PostCreator()
+    
+    def test_format_articles_for_post(self, make_creator, two_articles):
+        """Test article formatting for post prompt."""
+        creator, _ = make_creator(config_overrides={"max_articles_in_post": 3})
+        
+        formatted = creator._format_articles_for_post(two_articles)
+        
+        expected = (
+            "1. Test Article 1",
+            "This is a test summary for article 1",
+            "Source: Test Source 1",
+            "Published: 2024-01-01 00:00",
+            "Link: https://example.com/1",
+            "🎯 WHY THIS MATTERS: Highly relevant to AI agents due to direct framework discussion",
+            "2. Test Article 2",
+        )
+        missing = [part for part in expected if part not in formatted]
+        assert not missing, missing
+    
+    def test_create_post_success(self, make_creator, one_article):
         """Test successful post creation."""
-        with patch('processing.post_creator.load_config') as mock_load_config:
-            mock_config = {
-                "post_creator": {
-                    "chat_model": {"model": "gpt-4.1", "model_provider": "openai", "temperature": 0.7},
-                    "max_articles_in_post": 5,
-                    "post_prompt": "Create post for articles:\n{articles_text}",
-                    "system_message": "You are a post creator"
-                }
+        response = SimpleNamespace(content="*🤖 AI Agent Digest:* Exciting developments in AI agents!")
+        creator, chat_model = make_creator(
+            invoke_return=response,
+            config_overrides={
+                "post_prompt": "Create post for articles:\n{articles_text}",
+                "system_message": "You are a post creator"
             }
-            mock_load_config.return_value = mock_config
-            
-            with patch('processing.post_creator.init_chat_model') as mock_init_chat:
-                mock_chat_model = MagicMock()
-                mock_response = MagicMock()
-                mock_response.content = "*🤖 AI Agent Digest:* Exciting developments in AI agents!"
-                mock_chat_model.invoke.return_value = mock_response
-                mock_init_chat.return_value = mock_chat_model
-                
-                creator = PostCreator("test_config.yaml")
-                
-                articles = [
-                    ScoredArticle(guid="test-guid", title="Test Article", summary="Test summary", 
-                                source="Test Source", link="https://example.com", published_at=datetime.now(),
-                                reasoning="Excellent AI agent content")
-                ]
-                
-                result = creator.create_post(articles)
-                
-                assert "*🤖 AI Agent Digest:*" in result
-                mock_chat_model.invoke.assert_called_once()
+        )
+        
+        result = creator.create_post(one_article)
+        
+        assert "*🤖 AI Agent Digest:*" in result
+        assert chat_model.calls == 1
     
-    def test_create_post_fallback(self):
+    def test_create_post_fallback(self, make_creator, two_fallback_articles):
         """Test fallback post creation when LLM fails."""
-        with patch('processing.post_creator.load_config') as mock_load_config:
-            mock_config = {
-                "post_creator": {
-                    "chat_model": {"model": "gpt-4.1", "model_provider": "openai", "temperature": 0.7},
-                    "max_articles_in_post": 5,
-                    "post_prompt": "Test prompt",
-                    "system_message": "Test system message"
-                }
-            }
-            mock_load_config.return_value = mock_config
-            
-            with patch('processing.post_creator.init_chat_model') as mock_init_chat:
-                mock_chat_model = MagicMock()
-                mock_chat_model.invoke.side_effect = Exception("LLM failed")
-                mock_init_chat.return_value = mock_chat_model
-                
-                creator = PostCreator("test_config.yaml")
-                
-                articles = [
-                    ScoredArticle(guid="test-guid-1", title="Test Article 1", summary="Test summary 1", 
-                                source="Test Source 1", link="https://example.com/1", published_at=datetime.now(),
-                                reasoning="High relevance for AI agents"),
-                    ScoredArticle(guid="test-guid-2", title="Test Article 2", summary="Test summary 2", 
-                                source="Test Source 2", link="https://example.com/2", published_at=datetime.now(),
-                                reasoning="Good AI agent applications")
-                ]
-                
-                result = creator.create_post(articles)
-                
-                assert "<b>🤖 AI Agent Digest Update</b>" in result
-                assert "2 new articles" in result
-                assert '1. <a href="https://example.com/1">Test Article 1</a>' in result
-                assert '2. <a href="https://example.com/2">Test Article 2</a>' in result
-                assert "<code>Test Source 1</code>" in result
-                assert "<code>Test Source 2</code>" in result
-                assert "<b>Stay tuned for more AI agent developments!</b>" in result
+        creator, _ = make_creator(invoke_exc=Exception("LLM failed"))
+        
+        result = creator.create_post(two_fallback_articles)
+        
+        expected = (
+            "<b>🤖 AI Agent Digest Update</b>",
+            "2 new articles",
+            '1. <a href="https://example.com/1">Test Article 1</a>',
+            '2. <a href="https://example.com/2">Test Article 2</a>',
+            "<code>Test Source 1</code>",
+            "<code>Test Source 2</code>",
+            "<b>Stay tuned for more AI agent developments!</b>",
+        )
+        missing = [part for part in expected if part not in result]
+        assert not missing, missing
     
-    def test_fallback_post_html_formatting(self):
-        """Test that fallback post generates proper HTML formatting."""
-        with patch('processing.post_creator.load_config') as mock_load_config:
-            mock_config = {
-                "post_creator": {
-                    "chat_model": {"model": "gpt-4.1", "model_provider": "openai", "temperature": 0.7},
-                    "max_articles_in_post": 5,
-                    "post_prompt": "Test prompt",
-                    "system_message": "Test system message"
-                }
-            }
-            mock_load_config.return_value = mock_config
-            
-            with patch('processing.post_creator.init_chat_model') as mock_init_chat:
-                mock_chat_model = MagicMock()
-                mock_chat_model.invoke.side_effect = Exception("LLM failed")
-                mock_init_chat.return_value = mock_chat_model
-                
-                creator = PostCreator("test_config.yaml")
-                
-                articles = [
-                    ScoredArticle(
-                        guid="test-guid-1", 
-                        title="AI Agent Framework Released", 
-                        summary="New framework for building AI agents", 
-                        source="TechCrunch", 
-                        link="https://techcrunch.com/ai-agent-framework", 
-                        published_at=datetime.now(),
-                        reasoning="This is a groundbreaking development in AI agent technology that will enable developers to build more sophisticated autonomous systems"
-                    )
-                ]
-                
-                result = creator._create_fallback_post(articles)
-                
-                # Check HTML formatting elements
-                assert "<b>🤖 AI Agent Digest Update</b>" in result
-                assert "<i>1 new articles about AI agents and autonomous systems:</i>" in result
-                assert '<a href="https://techcrunch.com/ai-agent-framework">AI Agent Framework Released</a>' in result
-                assert "<code>TechCrunch</code>" in result
-                assert "<i>This is a groundbreaking development in AI agent technology that will enable developers to build mor...</i>" in result
-                assert "<b>Stay tuned for more AI agent developments!</b> 🚀" in result
-
-    def test_fallback_post_html_special_characters(self):
-        """Test that fallback post properly handles special characters in HTML."""
-        with patch('processing.post_creator.load_config') as mock_load_config:
-            mock_config = {
-                "post_creator": {
-                    "chat_model": {"model": "gpt-4.1", "model_provider": "openai", "temperature": 0.7},
-                    "max_articles_in_post": 5,
-                    "post_prompt": "Test prompt",
-                    "system_message": "Test system message"
-                }
-            }
-            mock_load_config.return_value = mock_config
-            
-            with patch('processing.post_creator.init_chat_model') as mock_init_chat:
-                mock_chat_model = MagicMock()
-                mock_chat_model.invoke.side_effect = Exception("LLM failed")
-                mock_init_chat.return_value = mock_chat_model
-                
-                creator = PostCreator("test_config.yaml")
-                
-                # Test with special characters that HTML handles naturally
-                articles = [
-                    ScoredArticle(
-                        guid="test-guid-1", 
-                        title="AI & ML: The Future of Technology!", 
-                        summary="Test summary with special chars: *bold* _italic_ [link](url)", 
-                        source="TechCrunch & Wired", 
-                        link="https://example.com/test?param=value&other=tag", 
-                        published_at=datetime.now(),
-                        reasoning="This article discusses *bold* AI developments & future technologies"
-                    )
-                ]
-                
-                result = creator._create_fallback_post(articles)
-                
-                # Check that special characters are properly escaped in HTML
-                assert "AI &amp; ML: The Future of Technology!" in result
-                assert "TechCrunch &amp; Wired" in result
-                assert "https://example.com/test?param=value&amp;other=tag" in result
-                assert "*bold* AI developments &amp; future technologies" in result
-                
-                # Ensure proper HTML formatting
-                assert "<b>🤖 AI Agent Digest Update</b>" in result
-                assert "<i>1 new articles about AI agents and autonomous systems:</i>" in result
-                assert '<a href="https://example.com/test?param=value&amp;other=tag">AI &amp; ML: The Future of Technology!</a>' in result
-                assert "<code>TechCrunch &amp; Wired</code>" in result
-                assert "<i>This article discusses *bold* AI developments &amp; future technologies</i>" in result
-                assert "<b>Stay tuned for more AI agent developments!</b> 🚀" in result
-
+    @pytest.mark.parametrize("articles_fixture, expected", [
+        pytest.param(
+            "long_reasoning_article",
+            "\n".join([
+                "<b>🤖 AI Agent Digest Update</b>",
+                "",
+                "📰 <i>1 new articles about AI agents and autonomous systems:</i>",
+                "",
+                '1. <a href="https://techcrunch.com/ai-agent-framework">AI Agent Framework Released</a>',
+                "   📍 <code>TechCrunch</code>",
+                "   💡 <i>This is a groundbreaking development in AI agent technology that will enable developers to build mor...</i>",
+                "",
+                "<b>Stay tuned for more AI agent developments!</b> 🚀",
+            ]),
+            id="html_formatting"
+        ),
+        pytest.param(
+            "one_article_special_chars",
+            "\n".join([
+                "<b>🤖 AI Agent Digest Update</b>",
+                "",
+                "📰 <i>1 new articles about AI agents and autonomous systems:</i>",
+                "",
+                # Special characters are escaped in the link, title, source and reasoning
+                '1. <a href="https://example.com/test?param=value&amp;other=tag">AI &amp; ML: The Future of Technology!</a>',
+                "   📍 <code>TechCrunch &amp; Wired</code>",
+                "   💡 <i>This article discusses *bold* AI developments &amp; future technologies</i>",
+                "",
+                "<b>Stay tuned for more AI agent developments!</b> 🚀",
+            ]),
+            id="html_special_characters"
+        ),
+    ])
+    def test_fallback_post_rendering(self, make_creator, request, articles_fixture, expected):
+        """Test that the fallback post renders to the expected HTML, compared as a whole."""
+        creator, _ = make_creator(invoke_exc=Exception("LLM failed"))
+        articles = request.getfixturevalue(articles_fixture)
+        
+        result = creator._create_fallback_post(articles)
+        
+        assert result == expected
@@ -1,39 +1,46 @@
 import os
-import yaml
 from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock
 
-from processing.scoring import RelevanceScorer
+import numpy as np
+import pytest
+
+from processing.scoring import RelevanceScorer, score_statistics
 from models.article import Article, ScoredArticle
 
 
+@pytest.fixture
+def scoring_config():
+    """Scoring configuration used by the tests, kept in memory."""
+    return {
+        "scoring": {
+            "chat_model": {
+                "model": "gpt-4",
+                "model_provider": "openai",
+                "temperature": 0.1
+            },
+            "scoring_prompt": "Score this article: {title} - {summary}",
+            "system_message": "You are an AI content curator."
+        }
+    }
+
+
+@pytest.fixture
+def config_path(monkeypatch, scoring_config):
+    """Config path for RelevanceScorer; loading it returns scoring_config without touching disk."""
+    monkeypatch.setattr('processing.scoring.load_config', lambda _path: scoring_config)
+    return "unused.yaml"
+
+
 class TestRelevanceScorer:
     """Tests for RelevanceScorer class."""
 
-    def create_test_config(self, tmp_path):
-        """Create a test scoring configuration file."""
-        config_data = {
-            "scoring": {
-                "chat_model": {
-                    "model": "gpt-4",
-                    "model_provider": "openai",
-                    "temperature": 0.1
-                },
-                "scoring_prompt": "Score this article: {title} - {summary}",
-                "system_message": "You are an AI content curator."
-            }
-        }
-        
-        config_file = tmp_path / "scoring_config.yaml"
-        config_file.write_text(yaml.dump(config_data))
-        return str(config_file)
-
-    def create_test_article(self):
+    def create_test_article(self, guid="test-guid-123", title="AI Agents in Modern Applications"):
         """Create a test article for scoring."""
         return Article(
-            guid="test-guid-123",
+            guid=guid,
             source="Test Source",
-            title="AI Agents in Modern Applications",
+            title=title,
             link="https://example.com/article",
             summary="This article discusses the role of AI agents in modern software applications.",
             author="Test Author",
@@ -45,84 +52,88 @@ class TestRelevanceScorer:
 
     @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
     @patch('processing.scoring.init_chat_model')
-    def test_score_article_success(self, mock_init_chat_model, tmp_path):
-        """Test successful article scoring."""
-        config_path = self.create_test_config(tmp_path)
+    def test_score_articles_success(self, mock_init_chat_model, config_path):
+        """Test scoring multiple articles successfully."""
         mock_chat_model = MagicMock()
         mock_structured_model = MagicMock()
         mock_chat_model.with_structured_output.return_value = mock_structured_model
         mock_init_chat_model.return_value = mock_chat_model
         
-        # Mock the structured response
-        mock_response = MagicMock()
-        mock_response.score = 85
-        mock_response.reasoning = "High relevance to AI agents"
-        mock_structured_model.invoke.return_value = mock_response
+        # Mock responses for multiple articles
+        mock_responses = [
+            MagicMock(score=85, reasoning="High relevance"),
+            MagicMock(score=70, reasoning="Moderate relevance")
+        ]
+        mock_structured_model.batch.return_value = mock_responses
         
         scorer = RelevanceScorer(config_path)
-        article = self.create_test_article()
+        articles = [self.create_test_article(), self.create_test_article("test-guid-456", "Multi-Agent Systems in Production")]
         relevance_text = "AI agents are becoming more sophisticated in modern applications"
         
-        score, reasoning = scorer._score_article(article, relevance_text)
+        scored_articles = scorer.score_articles(articles, relevance_text)
+        
+        assert len(scored_articles) == 2
+        assert all(isinstance(article, ScoredArticle) for article in scored_articles)
+        assert scored_articles[0].relevance_score == 85
+        assert scored_articles[1].relevance_score == 70
         
-        assert score == 85
-        assert reasoning == "High relevance to AI agents"
+        # Verify that all articles were scored in a single batch call
+        mock_structured_model.batch.assert_called_once()
+        assert len(mock_structured_model.batch.call_args.args[0]) == 2
+        mock_structured_model.invoke.assert_not_called()
 
     @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
     @patch('processing.scoring.init_chat_model')
-    def test_score_article_exception(self, mock_init_chat_model, tmp_path):
-        """Test article scoring with exception."""
-        config_path = self.create_test_config(tmp_path)
+    def test_score_articles_duplicate_content(self, mock_init_chat_model, config_path):
+        """Test that articles with identical content share one scoring request."""
         mock_chat_model = MagicMock()
         mock_structured_model = MagicMock()
         mock_chat_model.with_structured_output.return_value = mock_structured_model
         mock_init_chat_model.return_value = mock_chat_model
         
-        # Mock exception during scoring
-        mock_structured_model.invoke.side_effect = Exception("LLM API error")
+        mock_structured_model.batch.return_value = [MagicMock(score=85, reasoning="High relevance")]
         
         scorer = RelevanceScorer(config_path)
-        article = self.create_test_article()
+        articles = [self.create_test_article(), self.create_test_article("test-guid-456")]
         relevance_text = "AI agents are becoming more sophisticated in modern applications"
         
-        score, reasoning = scorer._score_article(article, relevance_text)
+        scored_articles = scorer.score_articles(articles, relevance_text)
         
-        assert score is None
-        assert reasoning is None
+        assert [article.guid for article in scored_articles] == ["test-guid-123", "test-guid-456"]
+        assert all(article.relevance_score == 85 for article in scored_articles)
+        mock_structured_model.batch.assert_called_once()
+        assert len(mock_structured_model.batch.call_args.args[0]) == 1
 
     @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
     @patch('processing.scoring.init_chat_model')
-    def test_score_articles_success(self, mock_init_chat_model, tmp_path):
-        """Test scoring multiple articles successfully."""
-        config_path = self.create_test_config(tmp_path)
+    def test_score_articles_batch_partial_failure(self, mock_init_chat_model, config_path):
+        """Test that a failed request in the batch only leaves its own article unscored."""
         mock_chat_model = MagicMock()
         mock_structured_model = MagicMock()
         mock_chat_model.with_structured_output.return_value = mock_structured_model
         mock_init_chat_model.return_value = mock_chat_model
         
-        # Mock responses for multiple articles
-        mock_responses = [
-            MagicMock(score=85, reasoning="High relevance"),
+        # Mock one failed and one successful response
+        mock_structured_model.batch.return_value = [
+            Exception("LLM API error"),
             MagicMock(score=70, reasoning="Moderate relevance")
         ]
-        mock_structured_model.invoke.side_effect = mock_responses
         
         scorer = RelevanceScorer(config_path)
-        articles = [self.create_test_article(), self.create_test_article()]
+        articles = [self.create_test_article(), self.create_test_article("test-guid-456", "Multi-Agent Systems in Production")]
         relevance_text = "AI agents are becoming more sophisticated in modern applications"
         
         scored_articles = scorer.score_articles(articles, relevance_text)
         
         assert len(scored_articles) == 2
-        assert all(isinstance(article, ScoredArticle) for article in scored_articles)
-        assert scored_articles[0].relevance_score == 85
+        assert scored_articles[0].relevance_score is None
+        assert scored_articles[0].reasoning is None
         assert scored_articles[1].relevance_score == 70
 
     @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
     @patch('processing.scoring.init_chat_model')
-    def test_score_articles_skip_already_scored(self, mock_init_chat_model, tmp_path):
+    def test_score_articles_skip_already_scored(self, mock_init_chat_model, config_path):
         """Test that articles with existing relevance scores are skipped."""
-        config_path = self.create_test_config(tmp_path)
         mock_chat_model = MagicMock()
         mock_structured_model = MagicMock()
         mock_chat_model.with_structured_output.return_value = mock_structured_model
@@ -161,7 +172,7 @@ class TestRelevanceScorer:
         mock_response = MagicMock()
         mock_response.score = 75
         mock_response.reasoning = "New score for unscored article"
-        mock_structured_model.invoke.return_value = mock_response
+        mock_structured_model.batch.return_value = [mock_response]
         
         scorer = RelevanceScorer(config_path)
         articles = [already_scored_article, unscored_article]
@@ -184,5 +195,19 @@ class TestRelevanceScorer:
         assert scored_by_guid["test-guid-unscored"].relevance_score == 75
         assert scored_by_guid["test-guid-unscored"].reasoning == "New score for unscored article"
         
-        # Verify that the LLM was only called once (for the unscored article)
-        assert mock_structured_model.invoke.call_count == 1
\ No newline at end of file
+        # Verify that the LLM was only asked to score the unscored article
+        mock_structured_model.batch.assert_called_once()
+        assert len(mock_structured_model.batch.call_args.args[0]) == 1
+
+
+class TestScoreStatistics:
+    """Tests for score_statistics function."""
+
+    def test_score_statistics(self):
+        """Test average and high relevance percentage of scores."""
+        scores = np.array([90, 70, 50, 30], dtype=np.int16)
+        
+        avg_score, high_relevance_percentage = score_statistics(scores)
+        
+        assert avg_score == 60.0
+        assert high_relevance_percentage == 50.0
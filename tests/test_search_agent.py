@@ -1,7 +1,8 @@
+import asyncio
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from datetime import datetime
-from search.agent import SearchAgent
+from search.agent import SearchAgent, SERPAPI_TIMEOUT_SECONDS
 from models.search_result import SearchResult
 
 
@@ -29,13 +30,13 @@ class TestSearchAgent:
     @patch.dict('os.environ', {'SERPAPI_KEY': 'test_key', 'OPENAI_API_KEY': 'test_openai_key'})
     @patch('search.agent.load_config')
     @patch('search.agent.init_chat_model')
-    @patch('search.agent.SerpAPIWrapper')
-    def test_search_success(self, mock_serpapi_wrapper, mock_chat_model, mock_load_config, mock_config):
+    @patch('search.agent.requests.Session')
+    def test_search_success(self, mock_session_class, mock_chat_model, mock_load_config, mock_config):
         """Test successful search with valid results."""
         # Setup mocks
         mock_load_config.return_value = mock_config
-        mock_serpapi_instance = MagicMock()
-        mock_serpapi_instance.results.return_value = {
+        mock_session = MagicMock()
+        mock_session.get.return_value.json.return_value = {
             "news_results": [
                 {
                     "title": "AI Agents Revolutionize Software Development",
@@ -46,7 +47,7 @@ class TestSearchAgent:
                 }
             ]
         }
-        mock_serpapi_wrapper.return_value = mock_serpapi_instance
+        mock_session_class.return_value = mock_session
         
         # Create SearchAgent instance
         agent = SearchAgent("dummy_config.yaml")
@@ -54,6 +55,11 @@ class TestSearchAgent:
         # Perform search
         results = agent.search("AI agents")
         
+        # Verify the request went through the shared session with the query and API key
+        params = mock_session.get.call_args.kwargs["params"]
+        assert params["q"] == "AI agents"
+        assert params["api_key"] == "test_key"
+        
         # Verify results
         assert len(results) == 1
         assert isinstance(results[0], SearchResult)
@@ -66,14 +72,14 @@ class TestSearchAgent:
     @patch.dict('os.environ', {'SERPAPI_KEY': 'test_key', 'OPENAI_API_KEY': 'test_openai_key'})
     @patch('search.agent.load_config')
     @patch('search.agent.init_chat_model')
-    @patch('search.agent.SerpAPIWrapper')
-    def test_search_empty_results(self, mock_serpapi_wrapper, mock_chat_model, mock_load_config, mock_config):
+    @patch('search.agent.requests.Session')
+    def test_search_empty_results(self, mock_session_class, mock_chat_model, mock_load_config, mock_config):
         """Test search with empty results."""
         # Setup mocks
         mock_load_config.return_value = mock_config
-        mock_serpapi_instance = MagicMock()
-        mock_serpapi_instance.results.return_value = {"news_results": []}
-        mock_serpapi_wrapper.return_value = mock_serpapi_instance
+        mock_session = MagicMock()
+        mock_session.get.return_value.json.return_value = {"news_results": []}
+        mock_session_class.return_value = mock_session
         
         # Create SearchAgent instance
         agent = SearchAgent("dummy_config.yaml")
@@ -87,14 +93,14 @@ class TestSearchAgent:
     @patch.dict('os.environ', {'SERPAPI_KEY': 'test_key', 'OPENAI_API_KEY': 'test_openai_key'})
     @patch('search.agent.load_config')
     @patch('search.agent.init_chat_model')
-    @patch('search.agent.SerpAPIWrapper')
-    def test_search_serpapi_exception(self, mock_serpapi_wrapper, mock_chat_model, mock_load_config, mock_config):
+    @patch('search.agent.requests.Session')
+    def test_search_serpapi_exception(self, mock_session_class, mock_chat_model, mock_load_config, mock_config):
         """Test search when SerpAPI raises an exception."""
         # Setup mocks
         mock_load_config.return_value = mock_config
-        mock_serpapi_instance = MagicMock()
-        mock_serpapi_instance.results.side_effect = Exception("SerpAPI error")
-        mock_serpapi_wrapper.return_value = mock_serpapi_instance
+        mock_session = MagicMock()
+        mock_session.get.side_effect = Exception("SerpAPI error")
+        mock_session_class.return_value = mock_session
         
         # Create SearchAgent instance
         agent = SearchAgent("dummy_config.yaml")
@@ -108,15 +114,15 @@ class TestSearchAgent:
     @patch.dict('os.environ', {'SERPAPI_KEY': 'test_key', 'OPENAI_API_KEY': 'test_openai_key'})
     @patch('search.agent.load_config')
     @patch('search.agent.init_chat_model')
-    @patch('search.agent.SerpAPIWrapper')
-    def test_summarize_results_success(self, mock_serpapi_wrapper, mock_chat_model, mock_load_config, mock_config):
+    @patch('search.agent.requests.Session')
+    def test_summarize_results_success(self, mock_session_class, mock_chat_model, mock_load_config, mock_config):
         """Test successful summary generation."""
         # Setup mocks
         mock_load_config.return_value = mock_config
         mock_chat_instance = MagicMock()
         mock_chat_instance.invoke.return_value = MagicMock(content="Generated summary of AI agents")
         mock_chat_model.return_value = mock_chat_instance
-        mock_serpapi_wrapper.return_value = MagicMock()
+        mock_session_class.return_value = MagicMock()
         
         # Create SearchAgent instance
         agent = SearchAgent("dummy_config.yaml")
@@ -142,13 +148,13 @@ class TestSearchAgent:
     @patch.dict('os.environ', {'SERPAPI_KEY': 'test_key', 'OPENAI_API_KEY': 'test_openai_key'})
     @patch('search.agent.load_config')
     @patch('search.agent.init_chat_model')
-    @patch('search.agent.SerpAPIWrapper')
-    def test_summarize_results_empty(self, mock_serpapi_wrapper, mock_chat_model, mock_load_config, mock_config):
+    @patch('search.agent.requests.Session')
+    def test_summarize_results_empty(self, mock_session_class, mock_chat_model, mock_load_config, mock_config):
         """Test summary generation with empty results."""
         # Setup mocks
         mock_load_config.return_value = mock_config
         mock_chat_model.return_value = MagicMock()
-        mock_serpapi_wrapper.return_value = MagicMock()
+        mock_session_class.return_value = MagicMock()
         
         # Create SearchAgent instance
         agent = SearchAgent("dummy_config.yaml")
@@ -162,15 +168,15 @@ class TestSearchAgent:
     @patch.dict('os.environ', {'SERPAPI_KEY': 'test_key', 'OPENAI_API_KEY': 'test_openai_key'})
     @patch('search.agent.load_config')
     @patch('search.agent.init_chat_model')
-    @patch('search.agent.SerpAPIWrapper')
-    def test_summarize_results_exception(self, mock_serpapi_wrapper, mock_chat_model, mock_load_config, mock_config):
+    @patch('search.agent.requests.Session')
+    def test_summarize_results_exception(self, mock_session_class, mock_chat_model, mock_load_config, mock_config):
         """Test summary generation when chat model raises an exception."""
         # Setup mocks
         mock_load_config.return_value = mock_config
         mock_chat_instance = MagicMock()
         mock_chat_instance.invoke.side_effect = Exception("Chat model error")
         mock_chat_model.return_value = mock_chat_instance
-        mock_serpapi_wrapper.return_value = MagicMock()
+        mock_session_class.return_value = MagicMock()
         
         # Create SearchAgent instance
         agent = SearchAgent("dummy_config.yaml")
@@ -195,13 +201,13 @@ class TestSearchAgent:
     @patch.dict('os.environ', {'SERPAPI_KEY': 'test_key', 'OPENAI_API_KEY': 'test_openai_key'})
     @patch('search.agent.load_config')
     @patch('search.agent.init_chat_model')
-    @patch('search.agent.SerpAPIWrapper')
-    def test_get_combined_query(self, mock_serpapi_wrapper, mock_chat_model, mock_load_config, mock_config):
+    @patch('search.agent.requests.Session')
+    def test_get_combined_query(self, mock_session_class, mock_chat_model, mock_load_config, mock_config):
         """Test getting combined query string from configuration."""
         # Setup mocks
         mock_load_config.return_value = mock_config
         mock_chat_model.return_value = MagicMock()
-        mock_serpapi_wrapper.return_value = MagicMock()
+        mock_session_class.return_value = MagicMock()
         
         # Create SearchAgent instance
         agent = SearchAgent("dummy_config.yaml")
@@ -210,4 +216,162 @@ class TestSearchAgent:
         combined_query = agent.get_combined_query()
         
         # Verify combined query
-        assert combined_query == "AI Agents | LangChain agents"
\ No newline at end of file
+        assert combined_query == "AI Agents | LangChain agents"
+
+    @patch.dict('os.environ', {'SERPAPI_KEY': 'test_key', 'OPENAI_API_KEY': 'test_openai_key'})
+    @patch('search.agent.load_config')
+    @patch('search.agent.init_chat_model')
+    @patch('search.agent.requests.Session')
+    def test_sync_session_opened_on_first_search_and_closed(self, mock_session_class, mock_chat_model, mock_load_config, mock_config):
+        """Test that the synchronous HTTP session is only opened by search() and released by close()."""
+        mock_load_config.return_value = mock_config
+        mock_session = MagicMock()
+        mock_session.get.return_value.json.return_value = {"news_results": []}
+        mock_session_class.return_value = mock_session
+        
+        agent = SearchAgent("dummy_config.yaml")
+        mock_session_class.assert_not_called()
+        
+        agent.search("AI Agents")
+        agent.search("LangChain agents")
+        mock_session_class.assert_called_once()
+        
+        agent.close()
+        mock_session.close.assert_called_once()
+
+    @patch.dict('os.environ', {'SERPAPI_KEY': 'test_key', 'OPENAI_API_KEY': 'test_openai_key'})
+    @patch('search.agent.load_config')
+    @patch('search.agent.init_chat_model')
+    @patch('search.agent.requests.Session')
+    def test_search_all_queries_async(self, mock_session_class, mock_chat_model, mock_load_config, mock_config):
+        """Test concurrent search over all configured queries keeps query order."""
+        # Setup mocks
+        mock_load_config.return_value = mock_config
+        mock_session_class.return_value = MagicMock()
+        
+        async def fetch_results(session, query):
+            return {
+                "news_results": [
+                    {
+                        "title": f"Result for {query}",
+                        "snippet": "Snippet",
+                        "source": "example.com",
+                        "date": "2024-01-15",
+                        "link": f"https://example.com/{query.replace(' ', '-')}"
+                    }
+                ]
+            }
+        
+        # Create SearchAgent instance
+        agent = SearchAgent("dummy_config.yaml")
+        
+        # Search all queries concurrently
+        with patch.object(agent, '_fetch_results_async', side_effect=fetch_results) as mock_fetch:
+            results = asyncio.run(agent.search_all_queries_async())
+        
+        # Verify results from every query, in configured order, over one shared session
+        assert [result.title for result in results] == ["Result for AI Agents", "Result for LangChain agents"]
+        assert mock_fetch.call_count == 2
+        assert mock_fetch.call_args_list[0].args[0] is mock_fetch.call_args_list[1].args[0]
+        # The shared session uses the same request timeout as the synchronous path
+        assert mock_fetch.call_args_list[0].args[0].timeout.total == SERPAPI_TIMEOUT_SECONDS
+
+    @patch.dict('os.environ', {'SERPAPI_KEY': 'test_key', 'OPENAI_API_KEY': 'test_openai_key'})
+    @patch('search.agent.load_config')
+    @patch('search.agent.init_chat_model')
+    @patch('search.agent.requests.Session')
+    def test_summarize_results_async(self, mock_session_class, mock_chat_model, mock_load_config, mock_config):
+        """Test async summary generation uses the chat model's ainvoke."""
+        # Setup mocks
+        mock_load_config.return_value = mock_config
+        mock_chat_instance = MagicMock()
+        mock_chat_instance.ainvoke = AsyncMock(return_value=MagicMock(content="Generated summary of AI agents"))
+        mock_chat_model.return_value = mock_chat_instance
+        mock_session_class.return_value = MagicMock()
+        
+        # Create SearchAgent instance
+        agent = SearchAgent("dummy_config.yaml")
+        
+        # Create test results
+        results = [
+            SearchResult(
+                title="AI Agents Guide",
+                snippet="Comprehensive guide to AI agents",
+                source="example.com",
+                published_date="2024-01-15",
+                link="https://example.com/ai-agents-guide"
+            )
+        ]
+        
+        # Generate summary
+        summary = asyncio.run(agent.summarize_results_async(results, "AI agents"))
+        
+        # Verify summary
+        assert summary == "Generated summary of AI agents"
+        mock_chat_instance.ainvoke.assert_awaited_once()
+        mock_chat_instance.invoke.assert_not_called()
+
+    @patch.dict('os.environ', {'SERPAPI_KEY': 'test_key', 'OPENAI_API_KEY': 'test_openai_key'})
+    @patch('search.agent.load_config')
+    @patch('search.agent.init_chat_model')
+    @patch('search.agent.requests.Session')
+    def test_summarize_results_skips_duplicates(self, mock_session_class, mock_chat_model, mock_load_config, mock_config):
+        """Test that the same story returned by several queries is summarized once."""
+        # Setup mocks
+        mock_load_config.return_value = mock_config
+        mock_chat_instance = MagicMock()
+        mock_chat_instance.invoke.return_value = MagicMock(content="Generated summary of AI agents")
+        mock_chat_model.return_value = mock_chat_instance
+        mock_session_class.return_value = MagicMock()
+        
+        # Create SearchAgent instance
+        agent = SearchAgent("dummy_config.yaml")
+        
+        # Create test results with the same story twice
+        result = SearchResult(
+            title="AI Agents Guide",
+            snippet="Comprehensive guide to AI agents",
+            source="example.com",
+            published_date="2024-01-15",
+            link="https://example.com/ai-agents-guide"
+        )
+        
+        # Generate summary
+        agent.summarize_results([result, result], "AI agents")
+        
+        # Verify the story appears once in the prompt
+        prompt = mock_chat_instance.invoke.call_args.args[0][1]["content"]
+        assert prompt.count("AI Agents Guide") == 1
+        assert "2. " not in prompt
+
+    @patch.dict('os.environ', {'SERPAPI_KEY': 'test_key', 'OPENAI_API_KEY': 'test_openai_key'})
+    @patch('search.agent.load_config')
+    @patch('search.agent.init_chat_model')
+    @patch('search.agent.requests.Session')
+    def test_search_multiple_queries_deduplicates(self, mock_session_class, mock_chat_model, mock_load_config, mock_config):
+        """Test that repeated queries are searched once and repeated links are returned once."""
+        # Setup mocks
+        mock_load_config.return_value = mock_config
+        mock_session = MagicMock()
+        mock_session.get.side_effect = lambda url, params, timeout: MagicMock(json=lambda: {
+            "news_results": [
+                {
+                    "title": f"Result for {params['q']}",
+                    "snippet": "Snippet",
+                    "source": "example.com",
+                    "date": "2024-01-15",
+                    "link": "https://example.com/shared"
+                }
+            ]
+        })
+        mock_session_class.return_value = mock_session
+        
+        # Create SearchAgent instance
+        agent = SearchAgent("dummy_config.yaml")
+        
+        # Search with a repeated query and overlapping results
+        results = agent.search_multiple_queries(["AI Agents", "LLM", "AI Agents"])
+        
+        # Verify each query ran once and the shared link kept its first result
+        assert mock_session.get.call_count == 2
+        assert [result.title for result in results] == ["Result for AI Agents"]
@@ -1,5 +1,9 @@
+import asyncio
+import feedparser
 import pytest
-from sources.loader import load_all_articles
+from datetime import datetime, timezone
+from unittest.mock import patch
+from sources.loader import fetch_rss_articles, load_all_articles, load_article_batches
 from models.article import Article
 from utils.constants import SOURCES_CONFIG_PATH
 
@@ -32,6 +36,80 @@ class TestSources:
         for item in items:
             assert isinstance(item.categories, list)
 
+    def test_load_article_batches_yields_batch_per_source(self, tmp_path):
+        """Verify that load_article_batches yields one batch per enabled RSS source."""
+        config = tmp_path / "sources.yaml"
+        config.write_text(
+            """
+            sources:
+              - name: Source1
+                type: rss
+                url: "https://example.com/feed1"
+                enabled: true
+              - name: Source2
+                type: rss
+                url: "https://example.com/feed2"
+                enabled: true
+              - name: Source3
+                type: rss
+                url: "https://example.com/feed3"
+                enabled: false
+            """
+        )
+
+        async def collect():
+            return [batch async for batch in load_article_batches(str(config))]
+
+        with patch("sources.loader.fetch_rss_articles", side_effect=lambda url, name: [name]) as mock_fetch:
+            batches = asyncio.run(collect())
+
+        assert sorted(batches) == [["Source1"], ["Source2"]]
+        assert mock_fetch.call_count == 2
+
+    def test_load_all_articles_flattens_batches(self, tmp_path):
+        """Verify that load_all_articles returns the articles of every enabled source as one list."""
+        config = tmp_path / "sources.yaml"
+        config.write_text(
+            """
+            sources:
+              - name: Source1
+                type: rss
+                url: "https://example.com/feed1"
+                enabled: true
+              - name: Source2
+                type: rss
+                url: "https://example.com/feed2"
+                enabled: true
+            """
+        )
+
+        with patch("sources.loader.fetch_rss_articles", side_effect=lambda url, name: [name]) as mock_fetch:
+            articles = load_all_articles(str(config))
+
+        assert sorted(articles) == ["Source1", "Source2"]
+        assert mock_fetch.call_count == 2
+
+    def test_fetch_rss_articles_uses_parsed_published_date(self):
+        """Verify that published dates come from feedparser's parsed UTC time."""
+        feed = feedparser.parse(
+            """<?xml version="1.0"?>
+            <rss version="2.0"><channel><title>Feed</title>
+            <item>
+              <title>Article</title>
+              <link>https://example.com/article</link>
+              <guid>article-1</guid>
+              <pubDate>Tue, 14 Oct 2025 10:00:00 +0200</pubDate>
+            </item>
+            </channel></rss>"""
+        )
+
+        with patch("sources.loader.feedparser.parse", return_value=feed), \
+             patch("sources.loader.date_parser.parse") as mock_date_parse:
+            articles = fetch_rss_articles("https://example.com/feed", "Source")
+
+        assert articles[0].published_at == datetime(2025, 10, 14, 8, 0, tzinfo=timezone.utc)
+        mock_date_parse.assert_not_called()
+
 
 class TestConfigValidation:
     """Negative tests for config validation."""
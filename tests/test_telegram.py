@@ -1,58 +1,168 @@
 """Tests for the telegram delivery module."""
 
-from unittest.mock import patch, MagicMock, AsyncMock
+import asyncio
+from unittest.mock import patch, MagicMock, AsyncMock, ANY
 import pytest
-from telegram.error import TelegramError
-from delivery.telegram import send
+from telegram.error import BadRequest, NetworkError, TelegramError
+from delivery import telegram
+from delivery.telegram import send, send_async
 
 
 class TestTelegramSend:
     """Test cases for the send function in telegram module."""
 
-    def test_send_success(self):
-        """Test successful message sending."""
-        with patch.dict('os.environ', {
+    @pytest.fixture(autouse=True)
+    def no_shared_bot(self, monkeypatch):
+        """Start without a shared bot so each test sees its own mocked Bot class."""
+        monkeypatch.setattr(telegram, '_shared_bot', None)
+
+    @pytest.fixture
+    def env(self, monkeypatch):
+        """Environment seen by os.getenv during the test, prefilled with valid credentials."""
+        env = {
             'TELEGRAM_BOT_TOKEN': 'test_bot_token',
-            'TELEGRAM_CHANNEL': 'test_channel_id',
-            'TELEGRAM_PARSE_MODE': 'HTML'
-        }):
-            with patch('delivery.telegram.Bot') as mock_bot_class:
-                mock_bot = MagicMock()
-                mock_bot_class.return_value = mock_bot
-                mock_message = MagicMock()
-                mock_message.message_id = 12345
-                # Mock the async send_message method
-                mock_bot.send_message = AsyncMock(return_value=mock_message)
-                
-                result = send("<b>Test Post</b>")
-                
-                assert result == 12345
-                mock_bot_class.assert_called_once_with(token='test_bot_token')
-                mock_bot.send_message.assert_called_once_with(
-                    chat_id='test_channel_id',
-                    text="<b>Test Post</b>",
-                    parse_mode='HTML',
-                    disable_web_page_preview=True
-                )
-
-    def test_send_missing_credentials(self):
+            'TELEGRAM_CHANNEL': 'test_channel_id'
+        }
+        monkeypatch.setattr('os.getenv', env.get)
+        return env
+
+    def test_send_success(self, env):
+        """Test successful message sending."""
+        env['TELEGRAM_PARSE_MODE'] = 'HTML'
+        with patch('delivery.telegram.Bot') as mock_bot_class:
+            mock_bot = MagicMock()
+            mock_bot_class.return_value = mock_bot
+            mock_message = MagicMock()
+            mock_message.message_id = 12345
+            # Mock the async send_message method
+            mock_bot.send_message = AsyncMock(return_value=mock_message)
+            
+            result = send("<b>Test Post</b>")
+            
+            assert result == 12345
+            mock_bot_class.assert_called_once_with(token='test_bot_token', request=ANY)
+            mock_bot.send_message.assert_called_once_with(
+                chat_id='test_channel_id',
+                text="<b>Test Post</b>",
+                parse_mode='HTML',
+                disable_web_page_preview=True
+            )
+
+    def test_send_missing_credentials(self, env):
         """Test that ValueError is raised when credentials are missing."""
-        with patch.dict('os.environ', {}, clear=True):
-            with pytest.raises(ValueError, match=".*credentials.*"):
-                send("Test message")
+        env.clear()
+        with pytest.raises(ValueError, match=".*credentials.*"):
+            send("Test message")
 
-    def test_send_telegram_error(self):
+    def test_send_telegram_error(self, env):
         """Test that TelegramError is properly handled and re-raised."""
-        with patch.dict('os.environ', {
-            'TELEGRAM_BOT_TOKEN': 'test_bot_token',
-            'TELEGRAM_CHANNEL': 'test_channel_id',
-            'TELEGRAM_PARSE_MODE': 'HTML'
-        }):
-            with patch('delivery.telegram.Bot') as mock_bot_class:
-                mock_bot = MagicMock()
-                mock_bot_class.return_value = mock_bot
-                # Mock the async send_message method to raise TelegramError
-                mock_bot.send_message = AsyncMock(side_effect=TelegramError("Bot was blocked"))
-                
-                with pytest.raises(TelegramError, match="Bot was blocked"):
-                    send("Test message")
\ No newline at end of file
+        env['TELEGRAM_PARSE_MODE'] = 'HTML'
+        with patch('delivery.telegram.Bot') as mock_bot_class:
+            mock_bot = MagicMock()
+            mock_bot_class.return_value = mock_bot
+            # Mock the async send_message method to raise TelegramError
+            mock_bot.send_message = AsyncMock(side_effect=TelegramError("Bot was blocked"))
+            
+            with pytest.raises(TelegramError, match="Bot was blocked"):
+                send("Test message")
+
+    def test_send_reuses_bot(self, env):
+        """Test that consecutive sends on one event loop share a single Bot instance."""
+        with patch('delivery.telegram.Bot') as mock_bot_class:
+            mock_bot = MagicMock()
+            mock_bot_class.return_value = mock_bot
+            mock_bot.send_message = AsyncMock(return_value=MagicMock(message_id=1))
+            
+            async def send_twice():
+                await send_async("First message")
+                await send_async("Second message")
+            
+            asyncio.run(send_twice())
+            
+            mock_bot_class.assert_called_once()
+            assert mock_bot.send_message.call_count == 2
+
+    def test_send_creates_bot_per_event_loop(self, env):
+        """Test that each send() gets its own Bot and closes its connections before the loop ends."""
+        with patch('delivery.telegram.Bot') as mock_bot_class, patch('delivery.telegram.HTTPXRequest') as mock_request_class:
+            mock_bot_class.return_value.send_message = AsyncMock(return_value=MagicMock(message_id=1))
+            mock_request_class.return_value.shutdown = AsyncMock()
+            
+            # Each send() runs on its own event loop
+            send("First message")
+            send("Second message")
+            
+            assert mock_bot_class.call_count == 2
+            assert mock_request_class.return_value.shutdown.await_count == 2
+            assert telegram._shared_bot is None
+
+    def test_send_closes_bot_on_error(self, env):
+        """Test that send() closes the bot's connections when sending fails."""
+        with patch('delivery.telegram.Bot') as mock_bot_class, patch('delivery.telegram.HTTPXRequest') as mock_request_class:
+            mock_bot_class.return_value.send_message = AsyncMock(side_effect=TelegramError("Bot was blocked"))
+            mock_request_class.return_value.shutdown = AsyncMock()
+            
+            with pytest.raises(TelegramError):
+                send("Test message")
+            
+            mock_request_class.return_value.shutdown.assert_awaited_once()
+            assert telegram._shared_bot is None
+
+    def test_send_async_replaces_bot_when_token_changes(self, env):
+        """Test that a new token on the same loop closes the previous bot before making a new one."""
+        with patch('delivery.telegram.Bot') as mock_bot_class, patch('delivery.telegram.HTTPXRequest') as mock_request_class:
+            first_request, second_request = MagicMock(), MagicMock()
+            first_request.shutdown = AsyncMock()
+            second_request.shutdown = AsyncMock()
+            mock_request_class.side_effect = [first_request, second_request]
+            mock_bot_class.return_value.send_message = AsyncMock(return_value=MagicMock(message_id=1))
+            
+            async def send_with_two_tokens():
+                await send_async("First message")
+                env['TELEGRAM_BOT_TOKEN'] = 'other_bot_token'
+                await send_async("Second message")
+            
+            asyncio.run(send_with_two_tokens())
+            
+            assert mock_bot_class.call_count == 2
+            first_request.shutdown.assert_awaited_once()
+            second_request.shutdown.assert_not_awaited()
+
+    def test_send_async_drops_bot_of_closed_loop(self, env):
+        """Test that a bot left over from a closed loop is replaced without awaiting its connections."""
+        with patch('delivery.telegram.Bot') as mock_bot_class, patch('delivery.telegram.HTTPXRequest') as mock_request_class:
+            mock_bot_class.return_value.send_message = AsyncMock(return_value=MagicMock(message_id=1))
+            mock_request_class.return_value.shutdown = AsyncMock()
+            
+            asyncio.run(send_async("First message"))
+            asyncio.run(send_async("Second message"))
+            
+            assert mock_bot_class.call_count == 2
+            mock_request_class.return_value.shutdown.assert_not_awaited()
+
+    def test_send_retries_network_error(self, env):
+        """Test that transient network errors are retried before succeeding."""
+        with patch('delivery.telegram.Bot') as mock_bot_class, patch('asyncio.sleep', new=AsyncMock()):
+            mock_bot = MagicMock()
+            mock_bot_class.return_value = mock_bot
+            mock_bot.send_message = AsyncMock(side_effect=[
+                NetworkError("Bad Gateway"),
+                MagicMock(message_id=42)
+            ])
+            
+            result = send("Test message")
+            
+            assert result == 42
+            assert mock_bot.send_message.call_count == 2
+
+    def test_send_does_not_retry_bad_request(self, env):
+        """Test that a BadRequest, which would fail again on retry, is raised after a single attempt."""
+        with patch('delivery.telegram.Bot') as mock_bot_class, patch('asyncio.sleep', new=AsyncMock()):
+            mock_bot = MagicMock()
+            mock_bot_class.return_value = mock_bot
+            mock_bot.send_message = AsyncMock(side_effect=BadRequest("Can't parse entities"))
+            
+            with pytest.raises(BadRequest):
+                send("<b>Broken post")
+            
+            assert mock_bot.send_message.call_count == 1
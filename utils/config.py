@@ -1,16 +1,15 @@
+import functools
+import os
 import yaml
-from pathlib import Path
 from typing import Dict, Any
+from utils.yaml_fast import SafeLoader
 
 
-def load_config(config_path: str) -> Dict[str, Any]:
-    """Load and validate YAML configuration file."""
-    path = Path(config_path)
-    if not path.exists():
-        raise FileNotFoundError(f"Config file not found: {config_path}")
-    
-    with open(path, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
+@functools.lru_cache(maxsize=32)
+def _load_config_cached(config_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a YAML configuration file; cached per file version (mtime and size)."""
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = yaml.load(f, Loader=SafeLoader)
     
     if not config:
         raise ValueError(f"Invalid config file: empty or malformed YAML in {config_path}")
@@ -18,6 +17,20 @@ def load_config(config_path: str) -> Dict[str, Any]:
     return config
 
 
+def load_config(config_path: str) -> Dict[str, Any]:
+    """
+    Load and validate YAML configuration file.
+    The parsed config is cached until the file changes on disk, so the returned
+    dict is shared between callers and must not be modified.
+    """
+    try:
+        stat = os.stat(config_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file not found: {config_path}") from None
+    
+    return _load_config_cached(config_path, stat.st_mtime_ns, stat.st_size)
+
+
 def get_database_file(config_path: str) -> str:
     """Load database file name from database configuration."""
     config = load_config(config_path)
@@ -32,6 +45,12 @@ def get_database_file(config_path: str) -> str:
     return db_file
 
 
+def is_database_wal_enabled(config_path: str) -> bool:
+    """Whether database connections use WAL mode ('database.wal', enabled by default)."""
+    config = load_config(config_path)
+    return bool(config.get("database", {}).get("wal", True))
+
+
 def get_sources_config(config_path: str) -> Dict[str, Any]:
     """Load sources configuration and validate it."""
     config = load_config(config_path)
@@ -0,0 +1,90 @@
+"""SQLite connection utilities."""
+
+import atexit
+import contextlib
+import functools
+import logging
+import sqlite3
+import threading
+from typing import Iterator, Tuple
+from utils.config import get_database_file, is_database_wal_enabled
+
+# Applied to connections with WAL enabled: readers run alongside a writer and
+# synchronous=NORMAL needs a single fsync per commit (checkpoints excepted)
+WAL_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA wal_autocheckpoint=1000",
+)
+
+# Applied to every connection: mmap_size lets reads come straight from
+# memory-mapped pages instead of copying them with read()
+PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Applied first: switching the journal mode needs a lock, so it must already wait
+# for other processes (a cron run, db/migrate.py) instead of failing right away
+BUSY_TIMEOUT_PRAGMA = "PRAGMA busy_timeout=30000"
+
+
+def configure_connection(conn: sqlite3.Connection, wal: bool = True) -> None:
+    """
+    Apply the shared PRAGMA settings to a connection.
+    With wal, the connection is switched to WAL mode; SQLite keeps its current
+    journal mode when it can't (e.g. for in-memory databases), so the mode it
+    reports back is checked and the WAL-only settings are skipped otherwise.
+    """
+    conn.execute(BUSY_TIMEOUT_PRAGMA)
+    if wal:
+        journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        if journal_mode.lower() == "wal":
+            for pragma in WAL_PRAGMAS:
+                conn.execute(pragma)
+        else:
+            logging.warning(f"SQLite did not enable WAL mode, journal_mode is '{journal_mode}'")
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+
+
+@functools.lru_cache(maxsize=None)
+def _connect(db_file: str, wal: bool = True) -> Tuple[sqlite3.Connection, threading.RLock]:
+    """Open the shared connection to a database file; called once per file."""
+    conn = sqlite3.connect(
+        db_file,
+        check_same_thread=False,
+        cached_statements=256,
+        isolation_level=None
+    )
+    configure_connection(conn, wal)
+    atexit.register(conn.close)
+    return conn, threading.RLock()
+
+
+@contextlib.contextmanager
+def get_connection(config_path: str) -> Iterator[sqlite3.Connection]:
+    """
+    Hold the process-wide connection to the database configured in config_path.
+    The connection stays open between calls, so its page and statement caches stay warm.
+    It runs in autocommit mode; use transaction() for multi-statement writes.
+    """
+    conn, lock = _connect(get_database_file(config_path), is_database_wal_enabled(config_path))
+    with lock:
+        yield conn
+
+
+@contextlib.contextmanager
+def transaction(config_path: str, mode: str = "DEFERRED") -> Iterator[sqlite3.Connection]:
+    """Run the block in one transaction on the shared connection, rolling back on error."""
+    with get_connection(config_path) as conn:
+        conn.execute(f"BEGIN {mode}")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            # A failed COMMIT (e.g. SQLITE_BUSY or an I/O error) leaves the transaction
+            # open; roll it back so the shared connection can start the next one
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
@@ -0,0 +1,10 @@
+"""Environment loading utilities."""
+
+import functools
+from dotenv import load_dotenv
+
+
+@functools.lru_cache(maxsize=None)
+def load_env_once() -> None:
+    """Load variables from the .env file, parsing it only on the first call."""
+    load_dotenv()
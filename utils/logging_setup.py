@@ -0,0 +1,17 @@
+"""Logging configuration shared by all entry points."""
+
+import functools
+import logging
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(module)s:%(funcName)s:%(lineno)d - %(message)s"
+
+
+@functools.lru_cache(maxsize=None)
+def init_logging(level: int = logging.INFO) -> None:
+    """Configure root logging once; later calls are no-ops."""
+    # Thread and process names are not part of the format, so skip collecting them per record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    logging.basicConfig(level=level, format=LOG_FORMAT)
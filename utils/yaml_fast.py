@@ -0,0 +1,8 @@
+"""YAML loader and dumper classes, backed by LibYAML when PyYAML was built with it."""
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+__all__ = ["SafeLoader", "SafeDumper"]